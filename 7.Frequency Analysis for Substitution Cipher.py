@@ -1,48 +1,277 @@
 # Simple Substitution Cipher - Frequency Analysis Attack
 
+import codecs
+import heapq
+import io
+import os
+import sys
 from collections import Counter
+from multiprocessing import Pool
 
-# Given ciphertext
-cipher_text = """53‡‡†305))6*;4826)4‡.)4‡);806*;48†8¶60))85;;]8*;:‡*8†83
+# Symbols that are only line wrapping; pass skip=LINE_BREAKS to leave them out
+LINE_BREAKS = "\r\n"
+
+
+# Streaming n-gram counter over any symbol alphabet (any Unicode characters).
+# Text is fed in chunks; the last max_n - 1 symbols are kept so n-grams that
+# cross a chunk boundary are counted exactly once. Every symbol is counted,
+# line breaks included, as Counter(text) does, unless listed in skip.
+# With capacity set, each order keeps at most that many n-grams (Space-Saving):
+# an n-gram that is not kept replaces the one with the smallest count and
+# takes over that count as its error. Kept counts are then never too low, the
+# true count of a kept gram lies in [counts[n][gram] - error[n][gram],
+# counts[n][gram]], and every n-gram seen more than symbols / capacity times
+# is kept.
+class StreamingNgramCounter:
+    def __init__(self, max_n=3, capacity=None, skip=""):
+        self.max_n = max_n
+        self.capacity = capacity
+        self.skip = str.maketrans("", "", skip) if skip else None
+        self.counts = {n: Counter() for n in range(1, max_n + 1)}
+        self.error = {n: Counter() for n in range(1, max_n + 1)}
+        self.heaps = {n: [] for n in range(1, max_n + 1)}  # (count, gram), stale entries skipped
+        self.head = ""      # first max_n - 1 symbols seen (for merging segments)
+        self.tail = ""      # last max_n - 1 symbols seen
+        self.symbols = 0
+
+    def _count_joined(self, left, right):
+        # Count n-grams of left + right that end inside right
+        text = left + right
+        for n in range(1, self.max_n + 1):
+            start = max(0, len(left) - n + 1)
+            if n == 1:
+                grams = Counter(right)
+            else:
+                grams = Counter(text[i:i + n] for i in range(start, len(text) - n + 1))
+            self._add(n, grams)
+
+    def _rebuild_heap(self, n):
+        heap = [(count, gram) for gram, count in self.counts[n].items()]
+        heapq.heapify(heap)
+        self.heaps[n] = heap
+        return heap
+
+    def _add(self, n, grams):
+        counts = self.counts[n]
+        if self.capacity is None:
+            counts.update(grams)
+            return
+        error, heap = self.error[n], self.heaps[n]
+        for gram, count in grams.items():
+            if gram in counts:
+                counts[gram] += count
+            elif len(counts) < self.capacity:
+                counts[gram] = count
+            else:
+                # evict the smallest kept count; the newcomer may have had as many
+                while counts.get(heap[0][1]) != heap[0][0]:
+                    heapq.heappop(heap)
+                low, evicted = heapq.heappop(heap)
+                del counts[evicted]
+                error.pop(evicted, None)
+                counts[gram] = low + count
+                error[gram] = low
+            heapq.heappush(heap, (counts[gram], gram))
+            if len(heap) > 4 * self.capacity + 64:
+                heap = self._rebuild_heap(n)
+
+    def _floor(self, n):
+        # Most an n-gram that is not kept can have occurred
+        counts = self.counts[n]
+        if self.capacity is None or len(counts) < self.capacity:
+            return 0
+        return min(counts.values())
+
+    def _merge_counts(self, n, other):
+        counts, theirs = self.counts[n], other.counts[n]
+        if self.capacity is None and other.capacity is None:
+            counts.update(theirs)
+            return
+        # A gram missing from one side may have occurred up to its floor there
+        mine_floor, their_floor = self._floor(n), other._floor(n)
+        merged, merged_error = Counter(), Counter()
+        for gram in counts.keys() | theirs.keys():
+            a = counts[gram] if gram in counts else mine_floor
+            b = theirs[gram] if gram in theirs else their_floor
+            merged[gram] = a + b
+            merged_error[gram] = ((self.error[n][gram] if gram in counts else mine_floor)
+                                  + (other.error[n][gram] if gram in theirs else their_floor))
+        if self.capacity is not None:
+            merged = Counter(dict(merged.most_common(self.capacity)))
+        self.counts[n] = merged
+        self.error[n] = Counter({gram: merged_error[gram] for gram in merged
+                                 if merged_error[gram]})
+        self._rebuild_heap(n)
+
+    def update(self, chunk):
+        if self.skip is not None:
+            chunk = chunk.translate(self.skip)
+        if not chunk:
+            return
+        keep = self.max_n - 1
+        self._count_joined(self.tail, chunk)
+        if len(self.head) < keep:
+            self.head = (self.head + chunk)[:keep]
+        self.tail = (self.tail + chunk)[-keep:] if keep else ""
+        self.symbols += len(chunk)
+
+    def feed(self, stream, chunk_size=1 << 20):
+        for chunk in iter(lambda: stream.read(chunk_size), ""):
+            self.update(chunk)
+        return self
+
+    def merge(self, other, adjacent=True):
+        # Add another counter's counts (e.g. from a parallel worker). With
+        # adjacent=True, other counted the text directly following this one,
+        # so the n-grams spanning the two segments are counted too.
+        keep = self.max_n - 1
+        for n in range(1, self.max_n + 1):
+            self._merge_counts(n, other)
+        if adjacent and self.tail and other.head:
+            text = self.tail + other.head
+            for n in range(2, self.max_n + 1):
+                start = max(0, len(self.tail) - n + 1)
+                self._add(n, Counter(text[i:i + n] for i in range(start, len(self.tail))
+                                     if len(self.tail) < i + n <= len(text)))
+        if adjacent:
+            if len(self.head) < keep:
+                self.head = (self.head + other.head)[:keep]
+            self.tail = (self.tail + other.tail)[-keep:] if keep else ""
+        self.symbols += other.symbols
+        return self
+
+    def most_common(self, n=1, k=None):
+        return self.counts[n].most_common(k)
+
+
+# Count a whole file. It is read as bytes and decoded like each range of
+# count_file_parallel (no newline translation, invalid UTF-8 replaced), so
+# both give the same counts for any file.
+def count_file(path, max_n=3, capacity=None, chunk_size=1 << 20):
+    return _count_segment((path, 0, os.path.getsize(path), max_n, capacity, chunk_size))
+
+
+def _count_segment(args):
+    path, start, end, max_n, capacity, chunk_size = args
+    counter = StreamingNgramCounter(max_n, capacity)
+    # incremental decoder: a character split across two reads is kept back
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = f.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            counter.update(decoder.decode(data))
+    counter.update(decoder.decode(b"", final=True))
+    return counter
+
+
+def _char_boundary(f, offset):
+    # Move offset forward to the start of a UTF-8 character
+    f.seek(offset)
+    while True:
+        b = f.read(1)
+        if not b or (b[0] & 0xC0) != 0x80:
+            return offset
+        offset += 1
+
+
+# Count a large file with several worker processes: the file is split into
+# byte ranges on character boundaries, each worker streams its range, and the
+# partial counters are merged in file order (boundary n-grams included).
+def count_file_parallel(path, workers=4, max_n=3, capacity=None, chunk_size=1 << 20):
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        cuts = sorted({_char_boundary(f, size * i // workers) for i in range(workers)} | {size})
+    jobs = [(path, a, b, max_n, capacity, chunk_size) for a, b in zip(cuts, cuts[1:])]
+    with Pool(len(jobs) or 1) as pool:
+        parts = pool.map(_count_segment, jobs)
+    total = StreamingNgramCounter(max_n, capacity)
+    for part in parts:
+        total.merge(part)
+    return total
+
+
+# Apply a symbol mapping in one pass, chunk by chunk, straight to an output
+# stream (symbols not in the mapping are kept)
+def translate_stream(src, dst, mapping, chunk_size=1 << 20):
+    table = str.maketrans(mapping)
+    for chunk in iter(lambda: src.read(chunk_size), ""):
+        dst.write(chunk.translate(table))
+
+
+# Serial and parallel counts must agree on CRLF text and on invalid UTF-8
+def self_test():
+    import tempfile
+    cases = {
+        "CRLF": "53‡‡†305))6*;4826)4‡.)4‡);806*\r\n;48†8¶60))85;;]8*;:‡*8†83\r\n".encode() * 50,
+        "invalid UTF-8": b"ab\xff\xfe\x80c\xe2\x80\r\n\xe2\x80\xa1\xc3" * 50,
+    }
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, data in cases.items():
+            path = os.path.join(tmp, "cipher.txt")
+            with open(path, 'wb') as f:
+                f.write(data)
+            serial = count_file(path, chunk_size=7)
+            parallel = count_file_parallel(path, workers=3, chunk_size=7)
+            passed = serial.counts == parallel.counts and serial.symbols == parallel.symbols
+            ok &= passed
+            print(f"count_file vs count_file_parallel, {name}: {'ok' if passed else 'FAILED'}")
+    return ok
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--self-test"]:
+        sys.exit(0 if self_test() else 1)
+
+    # Given ciphertext
+    cipher_text = """53‡‡†305))6*;4826)4‡.)4‡);806*;48†8¶60))85;;]8*;:‡*8†83
 (88)5*†;46(;88*96*?;8)*‡(;485);5*†2:*‡(;4956*2(5*—4)8¶8*
 ;4069285);)6†8)4‡‡;1(‡9;48081;8:8‡1;48†85;4)485†528806*81
 (‡9;48;(88;4(‡?34;48)4‡;161;:188;‡?;"""
 
-# Step 1: Count frequency of each character
-frequency = Counter(cipher_text)
-
-print("Character Frequency:")
-for char, freq in frequency.most_common():
-    print(f"{repr(char)} : {freq}")
-
-# Step 2: Common English letters by frequency
-english_freq = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
-
-print("\nMost common English letters (for reference):")
-print(english_freq)
-
-# Step 3: Optional – You can replace symbols manually based on pattern observation
-# Example (partial mapping for demo):
-mapping = {
-    '‡': 'T',
-    '†': 'H',
-    ')': 'E',
-    '*': 'A',
-    ';': 'R',
-    '8': 'O',
-    '4': 'N',
-    '5': 'I',
-    '6': 'S',
-    '3': 'D',
-}
-
-# Step 4: Replace using the mapping
-decrypted_text = ""
-for ch in cipher_text:
-    if ch in mapping:
-        decrypted_text += mapping[ch]
+    # Optional: analyse a file instead, e.g. python3 script.py cipher.txt
+    # (python3 script.py --self-test checks the file counters)
+    if len(sys.argv) > 1:
+        counter = count_file(sys.argv[1])
     else:
-        decrypted_text += ch  # keep same if not in mapping
+        counter = StreamingNgramCounter().feed(io.StringIO(cipher_text))
+
+    # Step 1: Count frequency of each character
+    print("Character Frequency:")
+    for char, freq in counter.most_common(1):
+        print(f"{repr(char)} : {freq}")
+
+    print("\nMost common digraphs and trigraphs:")
+    print(counter.most_common(2, 10))
+    print(counter.most_common(3, 10))
+
+    # Step 2: Common English letters by frequency
+    english_freq = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+
+    print("\nMost common English letters (for reference):")
+    print(english_freq)
+
+    # Step 3: Optional – You can replace symbols manually based on pattern observation
+    # Example (partial mapping for demo):
+    mapping = {
+        '‡': 'T',
+        '†': 'H',
+        ')': 'E',
+        '*': 'A',
+        ';': 'R',
+        '8': 'O',
+        '4': 'N',
+        '5': 'I',
+        '6': 'S',
+        '3': 'D',
+    }
 
-print("\nDecrypted (partial guess):")
-print(decrypted_text)
+    # Step 4: Replace using the mapping
+    print("\nDecrypted (partial guess):")
+    translate_stream(io.StringIO(cipher_text), sys.stdout, mapping)
+    print()
@@ -1,4 +1,6 @@
+from functools import lru_cache
 from string import ascii_uppercase
+from typing import Iterable, List
 
 def generate_cipher_alphabet(keyword: str) -> str:
     """
@@ -35,37 +37,58 @@ def build_maps(cipher_alphabet: str):
     return enc_map, dec_map
 
 
+class CompiledKey:
+    """
+    A cipher alphabet compiled once into str.translate tables for both
+    directions. Upper- and lowercase letters keep their case; every other
+    character passes through unchanged.
+    """
+    __slots__ = ("cipher_alphabet", "enc_table", "dec_table")
+
+    def __init__(self, cipher_alphabet: str):
+        plain = ascii_uppercase + ascii_uppercase.lower()
+        cipher = cipher_alphabet + cipher_alphabet.lower()
+        self.cipher_alphabet = cipher_alphabet
+        self.enc_table = str.maketrans(plain, cipher)
+        self.dec_table = str.maketrans(cipher, plain)
+
+    def encrypt(self, plaintext: str) -> str:
+        return plaintext.translate(self.enc_table)
+
+    def decrypt(self, ciphertext: str) -> str:
+        return ciphertext.translate(self.dec_table)
+
+
+KEY_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def compile_key(keyword: str) -> CompiledKey:
+    """
+    Return the CompiledKey for a keyword. The most recently used
+    KEY_CACHE_SIZE keywords are memoized, so repeated calls never redo setup.
+    """
+    return CompiledKey(generate_cipher_alphabet(keyword))
+
+
 def encrypt(plaintext: str, keyword: str) -> str:
-    cipher_alpha = generate_cipher_alphabet(keyword)
-    enc_map, _ = build_maps(cipher_alpha)
-
-    result = []
-    for ch in plaintext:
-        if ch.isalpha():
-            if ch.isupper():
-                result.append(enc_map[ch])
-            else:
-                # map lowercase by mapping uppercase then lowercasing
-                result.append(enc_map[ch.upper()].lower())
-        else:
-            result.append(ch)  # preserve punctuation/spaces/digits
-    return "".join(result)
+    return compile_key(keyword).encrypt(plaintext)
 
 
 def decrypt(ciphertext: str, keyword: str) -> str:
-    cipher_alpha = generate_cipher_alphabet(keyword)
-    _, dec_map = build_maps(cipher_alpha)
+    return compile_key(keyword).decrypt(ciphertext)
 
-    result = []
-    for ch in ciphertext:
-        if ch.isalpha():
-            if ch.isupper():
-                result.append(dec_map[ch])
-            else:
-                result.append(dec_map[ch.upper()].lower())
-        else:
-            result.append(ch)
-    return "".join(result)
+
+def encrypt_many(plaintexts: Iterable[str], keyword: str) -> List[str]:
+    """Encrypt many messages under one keyword (key setup done once)."""
+    key = compile_key(keyword)
+    return [key.encrypt(p) for p in plaintexts]
+
+
+def decrypt_many(ciphertexts: Iterable[str], keyword: str) -> List[str]:
+    """Decrypt many messages under one keyword (key setup done once)."""
+    key = compile_key(keyword)
+    return [key.decrypt(c) for c in ciphertexts]
 
 
 if __name__ == "__main__":
@@ -88,3 +111,8 @@ if __name__ == "__main__":
     print("Plaintext: ", sample_plain)
     print("Encrypted: ", encrypted)
     print("Decrypted: ", decrypted)
+
+    batch = encrypt_many(["Meet at noon.", "Bring the maps."], keyword)
+    print("\nBatch encrypted:", batch)
+    print("Batch decrypted:", decrypt_many(batch, keyword))
+    print("Key cache:", compile_key.cache_info())
@@ -6,6 +6,8 @@
 # E L A R G
 # D S T B C
 
+import playfair_engine as pf
+
 def generate_fixed_square():
     """Create the given fixed Playfair 5x5 matrix."""
     square = [
@@ -18,69 +20,14 @@ def generate_fixed_square():
     return square
 
 
-def find_position(square, letter):
-    """Find row and column of a letter in the square."""
-    if letter == 'J':  # I and J are the same
-        letter = 'I'
-    for i in range(5):
-        for j in range(5):
-            if square[i][j] == letter:
-                return i, j
-    return None, None
-
-
 def prepare_text(text):
     """Prepare plaintext: remove non-letters, handle pairs, add filler if needed."""
-    text = text.upper()
-    text = ''.join([ch for ch in text if ch.isalpha()])  # keep only letters
-    text = text.replace('J', 'I')  # replace J with I
-
-    prepared = ""
-    i = 0
-    while i < len(text):
-        a = text[i]
-        b = text[i + 1] if i + 1 < len(text) else 'X'
-
-        if a == b:  # same letter pair -> insert X
-            prepared += a + 'X'
-            i += 1
-        else:
-            prepared += a + b
-            i += 2
-
-    if len(prepared) % 2 != 0:
-        prepared += 'X'
-
-    return prepared
-
-
-def encrypt_pair(a, b, square):
-    """Encrypt a single pair using Playfair rules."""
-    row1, col1 = find_position(square, a)
-    row2, col2 = find_position(square, b)
-
-    if row1 == row2:
-        # Same row → move right
-        return square[row1][(col1 + 1) % 5] + square[row2][(col2 + 1) % 5]
-    elif col1 == col2:
-        # Same column → move down
-        return square[(row1 + 1) % 5][col1] + square[(row2 + 1) % 5][col2]
-    else:
-        # Rectangle rule → swap columns
-        return square[row1][col2] + square[row2][col1]
+    return pf.prepare_text(text)
 
 
 def encrypt(text, square):
     """Encrypt the prepared plaintext using the Playfair cipher."""
-    prepared = prepare_text(text)
-    ciphertext = ""
-
-    for i in range(0, len(prepared), 2):
-        a = prepared[i]
-        b = prepared[i + 1]
-        ciphertext += encrypt_pair(a, b, square)
-
-    return ciphertext
+    return pf.compile_key(square).encrypt_prepared(prepare_text(text))
 
 
 # --- MAIN PROGRAM ---
@@ -1,4 +1,7 @@
 import math
+import random
+
+import playfair_engine as pf
 
 def playfair_keyspace():
     # 25 letters (I/J combined)
@@ -19,5 +22,52 @@ def playfair_keyspace():
     print(f"Effectively unique keys = {unique_keys:.3e}")
     print(f"Approx. as 2^{unique_power_of_2:.2f}")
 
+def grid_symmetries(square):
+    """The 8 rotations/reflections of the 5x5 grid, as square strings."""
+    rows = pf.square_rows(square)
+    out = []
+    for _ in range(4):
+        rows = [list(r) for r in zip(*rows[::-1])]           # rotate 90 degrees
+        for grid in (rows, [r[::-1] for r in rows]):         # and its mirror image
+            out.append("".join("".join(r) for r in grid))
+    return out
+
+
+def verify_equivalence_classes(samples=20, seed=1):
+    """
+    Count equivalent keys on random squares: every row/column shift of every
+    rotation or mirror image of a square (200 rearrangements) is compiled,
+    and those encrypting all 625 digraphs exactly like the square are
+    counted. Also checks that canonical_square gives one representative per
+    class. Returns the class sizes found.
+    """
+    rng = random.Random(seed)
+    sizes = []
+    canonical = set()
+    for _ in range(samples):
+        letters = list(pf.ALPHABET)
+        rng.shuffle(letters)
+        square = "".join(letters)
+        reference = pf.PlayfairKey(square).enc
+        same = {candidate
+                for variant in grid_symmetries(square)
+                for candidate in pf.equivalent_squares(variant)
+                if pf.PlayfairKey(candidate).enc == reference}
+        sizes.append(len(same))
+        forms = {pf.canonical_square(candidate) for candidate in same}
+        assert len(forms) == 1, "canonical_square split an equivalence class"
+        canonical |= forms
+    assert len(canonical) == samples, "canonical_square merged different keys"
+    return sizes
+
+
 if __name__ == "__main__":
     playfair_keyspace()
+
+    print("\nVerifying equivalent squares on random keys...")
+    sizes = verify_equivalence_classes()
+    print(f"Class sizes over {len(sizes)} random squares: {sorted(set(sizes))}")
+    if set(sizes) == {25}:
+        unique_keys = math.factorial(25) // 25
+        print("Only the 25 cyclic row/column shifts encrypt identically, so")
+        print(f"distinct keys = 25!/25 = 24! = {unique_keys:.3e} (2^{math.log2(unique_keys):.2f})")
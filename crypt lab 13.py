@@ -1,5 +1,14 @@
+import itertools
+
 import numpy as np
 
+import hill_engine as hill
+
+# English letter frequency (percent, A..Z) for checking decryptions
+ENGLISH_FREQ = np.array([8.17, 1.49, 2.78, 4.25, 12.70, 2.23, 2.02, 6.09, 6.97, 0.15, 0.77,
+                         4.03, 2.41, 6.75, 7.51, 1.93, 0.10, 5.99, 6.33, 9.06, 2.76, 0.98,
+                         2.36, 0.15, 1.97, 0.07])
+
 # Convert letter to number (A=0,...,Z=25)
 def char_to_num(c):
     return ord(c.upper()) - ord('A')
@@ -8,19 +17,19 @@ def char_to_num(c):
 def num_to_char(n):
     return chr((n % 26) + ord('A'))
 
-# Convert string to numeric vector
+# Convert string to matrix with one block per column (c = K p, as in crypt ;ab 12.py)
 def text_to_matrix(text, size):
     text = text.upper().replace(" ", "")
     nums = [char_to_num(c) for c in text]
     # Split into blocks of given size
-    return np.array(nums).reshape(size, size)
+    return np.array(nums).reshape(size, size).T
 
-# Modular inverse of a matrix (mod 26)
+# Modular inverse of a matrix (mod 26): exact integer Gauss-Jordan (hill_engine)
 def mod_inverse_matrix(matrix, mod=26):
-    det = int(round(np.linalg.det(matrix))) % mod
-    det_inv = pow(det, -1, mod)
-    matrix_mod_inv = det_inv * np.round(det * np.linalg.inv(matrix)).astype(int)
-    return np.mod(matrix_mod_inv, mod)
+    inverse = hill.inverse_mod(np.asarray(matrix).tolist(), mod)
+    if inverse is None:
+        raise ValueError(f"matrix is not invertible mod {mod}")
+    return np.array(inverse)
 
 # Known plaintext attack function
 def known_plaintext_attack(plaintext, ciphertext, block_size=2):
@@ -44,8 +53,112 @@ def known_plaintext_attack(plaintext, ciphertext, block_size=2):
 
     return K
 
-# Example Known Plaintext & Ciphertext
-plaintext = "HELP"
-ciphertext = "ZEBB"   # Example ciphertext from encryption using unknown key
+# Chi-square distance from English of each row of letter counts (lower is better)
+def chi_square(counts):
+    counts = np.asarray(counts, dtype=np.float64)
+    totals = counts.sum(axis=-1, keepdims=True)
+    expected = totals * ENGLISH_FREQ / 100
+    return ((counts - expected) ** 2 / expected).sum(axis=-1)
+
+# First choice of block_size crib blocks (as a matrix with blocks in columns)
+# that is invertible mod 13; returns (block indices, inverse mod 13) or None
+def pick_invertible_blocks(blocks, block_size, max_subsets=256):
+    subsets = list(itertools.islice(itertools.combinations(range(len(blocks)), block_size),
+                                    max_subsets))
+    if not subsets:
+        return None
+    inverses, ok = hill.inverse_mod_prime(blocks[np.array(subsets)].transpose(0, 2, 1), 13)
+    if not ok.any():
+        return None
+    first = int(ok.argmax())
+    return np.array(subsets[first]), inverses[first]
+
+# Keys mod 2 consistent with the crib at each offset. Short cribs are often
+# singular mod 2, so each key row is found by trying all 2^n rows against
+# every crib block; offsets where a row has several fits get every combination.
+# Returns (offset indices, keys mod 2).
+def keys_mod2(P, window, n):
+    rows = (np.arange(2 ** n)[:, None] >> np.arange(n)) & 1     # (2^n, n)
+    images = (P @ rows.T) % 2                                    # (k, 2^n)
+    fits = ((window % 2)[:, :, :, None] == images[None, :, None, :]).all(axis=1)
+    counts = fits.sum(axis=2)                                    # (offsets, n)
+    single = np.flatnonzero((counts == 1).all(axis=1))
+    where = [single]
+    keys = [rows[fits[single].argmax(axis=2)]]
+    for o in np.flatnonzero((counts >= 1).all(axis=1) & (counts > 1).any(axis=1)):
+        choices = [np.flatnonzero(fits[o, i]) for i in range(n)]
+        combos = np.array(list(itertools.product(*choices)))
+        where.append(np.full(len(combos), o))
+        keys.append(rows[combos])
+    return np.concatenate(where), np.concatenate(keys)
+
+# Known-plaintext attack when the crib's position is unknown: the crib is slid
+# over every offset of the ciphertext. The key satisfies K P = C for the crib
+# blocks P (in columns) and their ciphertext C; it is solved mod 13 from
+# block_size crib blocks invertible mod 13 (one batched product over all
+# offsets), mod 2 row by row, and joined with the CRT, so a crib whose blocks
+# are singular mod 26 still works. A candidate is kept only if it maps every
+# crib block onto the ciphertext and is invertible; survivors decrypt the
+# whole text and are ranked by chi-square against English letter frequencies.
+# A crib of only a few blocks can fit several keys at the true offset (they
+# differ mod 2); a longer crib narrows them down to one.
+# Returns [(chi_square, offset, key, plaintext), ...], best first.
+def sliding_crib_attack(ciphertext, crib, block_size=2, top_n=5):
+    n = block_size
+    C = hill.text_to_blocks(ciphertext, n)
+    crib_letters = hill.clean_text(crib)
+    found = {}
+    for skip in range(n):
+        # crib letters before its first block boundary, then k whole blocks
+        k = (len(crib_letters) - skip) // n
+        if k < n:
+            continue
+        P = hill.text_to_blocks(crib_letters[skip:skip + k * n], n)
+        picked = pick_invertible_blocks(P, n)
+        first = 1 if skip else 0                       # offset = block * n - skip must be >= 0
+        starts = np.arange(first, len(C) - k + 1)      # block where the crib's whole blocks start
+        if picked is None or len(starts) == 0:
+            continue
+        subset, inv13 = picked
+        window = C[starts[:, None] + np.arange(k)]      # (offsets, k, n)
+        K13 = (window[:, subset].transpose(0, 2, 1) @ inv13) % 13
+        where, K2 = keys_mod2(P, window, n)
+        K = (13 * K2 + 14 * K13[where]) % 26
+        predicted = (K @ P.T) % 26                     # (candidates, n, k)
+        consistent = (predicted == window[where].transpose(0, 2, 1)).all(axis=(1, 2))
+        K, where = K[consistent], where[consistent]
+        if len(K) == 0:
+            continue
+        K_inv, ok = hill.inverse_mod_batch(K)
+        K, K_inv, where = K[ok], K_inv[ok], where[ok]
+        if len(K) == 0:
+            continue
+        plain = (C @ K_inv.transpose(0, 2, 1)) % 26    # (candidates, blocks, n)
+        flat = plain.reshape(len(K), -1)
+        counts = np.bincount((flat + 26 * np.arange(len(K))[:, None]).ravel(),
+                             minlength=26 * len(K)).reshape(len(K), 26)
+        scores = chi_square(counts)
+        for score, start, key, text in zip(scores, starts[where], K, flat):
+            key = tuple(map(tuple, key.tolist()))
+            if key not in found or score < found[key][0]:
+                found[key] = (float(score), int(start * n - skip), [list(r) for r in key],
+                              hill.blocks_to_text(text))
+    return sorted(found.values(), key=lambda r: r[0])[:top_n]
+
+if __name__ == "__main__":
+    # Example Known Plaintext & Ciphertext
+    plaintext = "HELP"
+    ciphertext = "ZEBB"   # Example ciphertext from encryption using unknown key
+
+    key = known_plaintext_attack(plaintext, ciphertext, block_size=2)
 
-key = known_plaintext_attack(plaintext, ciphertext, block_size=2)
+    # Crib at an unknown position in a longer message (3x3 key)
+    message = ("the meeting is moved to the old mill by the river and we will attack "
+               "at dawn once the guards change so bring the maps and the radio")
+    secret = hill.random_key(3)
+    long_ciphertext = hill.encrypt(message, secret)
+    crib = "WEWILLATTACKATDAWNONCETHEGUARDS"
+    print(f"\nSliding crib {crib!r} over", len(long_ciphertext), "letters of ciphertext")
+    for score, offset, key, plain in sliding_crib_attack(long_ciphertext, crib, 3):
+        print(f"offset {offset:3}  chi-square {score:7.1f}  key {key}  {plain[:40]}")
+    print("Actual key:", secret.matrix.tolist())
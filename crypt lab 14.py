@@ -1,9 +1,132 @@
-import random
+import mmap
+import os
+import queue
 import string
+import sys
+import threading
+
+try:
+    import fcntl
+except ImportError:      # no advisory locking on this platform
+    fcntl = None
+
+try:
+    import numpy as np
+except ImportError:      # files are still handled, just more slowly
+    np = None
+
+# ---------------------------------------------------------------------------
+# Keystream generation
+#
+# Key material comes from os.urandom in large blocks. For the A-Z pad a byte
+# b is kept only if b < 234 (= 9 * 26) and then reduced mod 26, which makes
+# every value 0..25 equally likely; the filtering and reduction are a single
+# bytes.translate call per block instead of a Python loop per value.
+# ---------------------------------------------------------------------------
+KEY_BLOCK_SIZE = 1 << 16
+_MOD26_TABLE = bytes(b % 26 for b in range(256))
+_MOD26_REJECT = bytes(range(234, 256))
+
+
+def random_block(mode="mod26", size=KEY_BLOCK_SIZE):
+    """One block of keystream: values 0..25 ('mod26', about 91% of size) or raw bytes ('bytes')."""
+    raw = os.urandom(size)
+    if mode == "bytes":
+        return raw
+    if mode == "mod26":
+        return raw.translate(_MOD26_TABLE, _MOD26_REJECT)
+    raise ValueError(f"unknown keystream mode: {mode!r}")
+
+
+def random_keystream(length, mode="mod26"):
+    """length keystream values as bytes, generated synchronously in bulk."""
+    out = bytearray()
+    while len(out) < length:
+        out += random_block(mode, max(KEY_BLOCK_SIZE, (length - len(out)) * 9 // 8 + 64))
+    return bytes(out[:length])
+
+
+class KeystreamPool:
+    """
+    Keeps up to max_blocks blocks of keystream generated ahead of time by a
+    background thread, so take() normally only copies bytes. If the pool has
+    run dry, take() generates what it needs itself rather than wait.
+    """
+
+    def __init__(self, mode="mod26", block_size=KEY_BLOCK_SIZE, max_blocks=64):
+        self.mode = mode
+        self.block_size = block_size
+        self._blocks = queue.Queue(maxsize=max_blocks)
+        self._leftover = b""
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._fill, name="keystream-prefetch", daemon=True)
+        self._thread.start()
+
+    def _fill(self):
+        while not self._stop.is_set():
+            block = random_block(self.mode, self.block_size)
+            while not self._stop.is_set():
+                try:
+                    self._blocks.put(block, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def take(self, length):
+        """Return length keystream values as bytes; no two calls share any."""
+        with self._lock:
+            parts = [self._leftover]
+            have = len(self._leftover)
+            while have < length:
+                try:
+                    block = self._blocks.get_nowait()
+                except queue.Empty:
+                    block = random_keystream(length - have, self.mode)
+                parts.append(block)
+                have += len(block)
+            data = b"".join(parts)
+            self._leftover = data[length:]
+            return data[:length]
+
+    def check_mode(self, mode):
+        """Raise ValueError unless this pool produces keystream of the given mode."""
+        if self.mode != mode:
+            raise ValueError(f"need a {mode!r} keystream pool, got a {self.mode!r} one")
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 
 # Function to generate a random key stream of the same length as plaintext
-def generate_key(length):
-    return [random.randint(0, 25) for _ in range(length)]
+# (values 0..25 from os.urandom; pass a "mod26" KeystreamPool to draw from its prefetch)
+def generate_key(length, pool=None):
+    if pool is not None:
+        pool.check_mode("mod26")
+        return list(pool.take(length))
+    return list(random_keystream(length))
+
+
+def write_key_file(path, size, pool=None, chunk_size=1 << 20):
+    """
+    Write size random bytes to path, e.g. a pad for encrypt_otp_file.
+    pool, if given, must be a 'bytes' KeystreamPool.
+    """
+    if pool is not None:
+        pool.check_mode("bytes")
+    with open(path, 'wb') as f:
+        left = size
+        while left > 0:
+            n = min(chunk_size, left)
+            f.write(pool.take(n) if pool is not None else os.urandom(n))
+            left -= n
 
 # Function to encrypt plaintext using one-time pad (Vigenère style)
 def encrypt_otp(plaintext, key):
@@ -24,19 +147,376 @@ def decrypt_otp(ciphertext, key):
         plaintext += chr(p + ord('A'))
     return plaintext
 
+# ---------------------------------------------------------------------------
+# Byte-level one-time pad for files of any size
+#
+# Input and key are read through fixed-size readinto() buffers and XORed
+# straight into a memory-mapped, preallocated output file, so RAM use does
+# not grow with the file. Every encryption reserves its key range in a
+# sidecar index (<keyfile>.used) first; a range that overlaps one already
+# used is refused. The ciphertext starts with a small header holding the key
+# offset and length, so decryption knows which part of the key to use.
+# ---------------------------------------------------------------------------
+CHUNK_SIZE = 1 << 20
+HEADER_MAGIC = b"OTP1"
+HEADER_SIZE = len(HEADER_MAGIC) + 16      # magic + key offset + length (u64 each)
+
+
+class KeyReuseError(ValueError):
+    """Raised when a key range has already been used (or is out of key)."""
+
+
+def used_index_path(key_path):
+    return key_path + ".used"
+
+
+def read_used_ranges(index):
+    """(start, end) key byte ranges listed in an open sidecar index file."""
+    ranges = []
+    for line in index:
+        if line.strip():
+            start, end = line.split()
+            ranges.append((int(start), int(end)))
+    return ranges
+
+
+def load_used_ranges(key_path):
+    """List of consumed (start, end) key byte ranges from the sidecar index."""
+    try:
+        with open(used_index_path(key_path), 'r') as f:
+            return read_used_ranges(f)
+    except FileNotFoundError:
+        return []
+
+
+def reserve_key_range(key_path, length, offset=None):
+    """
+    Mark key bytes [offset, offset + length) as used and return offset.
+    With offset=None the range starts right after the highest used byte.
+    The index file is locked while it is checked and appended to.
+    """
+    key_size = os.path.getsize(key_path)
+    with open(used_index_path(key_path), 'a+') as index:
+        if fcntl is not None:
+            fcntl.flock(index, fcntl.LOCK_EX)
+        index.seek(0)
+        ranges = read_used_ranges(index)
+        if offset is None:
+            offset = max((end for _, end in ranges), default=0)
+        end = offset + length
+        if offset < 0 or end > key_size:
+            raise KeyReuseError(f"key has {key_size} bytes, need [{offset}, {end})")
+        for used_start, used_end in ranges:
+            if offset < used_end and used_start < end:
+                raise KeyReuseError(
+                    f"key bytes [{offset}, {end}) overlap used range [{used_start}, {used_end})")
+        index.seek(0, os.SEEK_END)
+        index.write(f"{offset} {end}\n")
+        index.flush()
+        os.fsync(index.fileno())
+    return offset
+
+
+def xor_bytes(a, b):
+    """XOR two equal-length byte buffers (one big-int operation, no Python loop)."""
+    n = len(a)
+    return (int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')).to_bytes(n, 'little')
+
+
+def _xor_stream(src, key, out, out_pos, length, chunk_size):
+    """
+    XOR length bytes of src with key into the writable buffer out at out_pos.
+    With NumPy the XOR is written straight into out; without it, xor_bytes.
+    """
+    data_buf = bytearray(chunk_size)
+    key_buf = bytearray(chunk_size)
+    data_view, key_view = memoryview(data_buf), memoryview(key_buf)
+    done = 0
+    while done < length:
+        want = min(chunk_size, length - done)
+        got = src.readinto(data_view[:want])
+        if got != want or key.readinto(key_view[:want]) != want:
+            raise ValueError("input or key ended early")
+        if np is not None:
+            target = np.frombuffer(out, np.uint8, count=want, offset=out_pos + done)
+            np.bitwise_xor(np.frombuffer(data_buf, np.uint8, count=want),
+                           np.frombuffer(key_buf, np.uint8, count=want), out=target)
+            del target      # release the view so the mapping can be closed
+        else:
+            out[out_pos + done:out_pos + done + want] = xor_bytes(data_view[:want], key_view[:want])
+        done += want
+
+
+def _preallocated_map(path, size):
+    """Create path with size bytes and return (file, writable mmap) or (file, None) if empty."""
+    f = open(path, 'w+b')
+    f.truncate(size)
+    if size == 0:
+        return f, None
+    return f, mmap.mmap(f.fileno(), size)
+
+
+def encrypt_otp_file(in_path, key_path, out_path, offset=None, chunk_size=CHUNK_SIZE):
+    """
+    Encrypt a file with bytes of key_path and return the key offset used.
+    Raises KeyReuseError if those key bytes were used before.
+    """
+    length = os.path.getsize(in_path)
+    offset = reserve_key_range(key_path, length, offset)
+    header = HEADER_MAGIC + offset.to_bytes(8, 'little') + length.to_bytes(8, 'little')
+    out_file, out = _preallocated_map(out_path, HEADER_SIZE + length)
+    try:
+        with open(in_path, 'rb') as src, open(key_path, 'rb') as key:
+            key.seek(offset)
+            if out is None:
+                out_file.write(header)
+            else:
+                out[:HEADER_SIZE] = header
+                _xor_stream(src, key, out, HEADER_SIZE, length, chunk_size)
+                out.flush()
+    finally:
+        if out is not None:
+            out.close()
+        out_file.close()
+    return offset
+
+
+def decrypt_otp_file(in_path, key_path, out_path, chunk_size=CHUNK_SIZE):
+    """Decrypt a file written by encrypt_otp_file (the key range is read, not reserved)."""
+    with open(in_path, 'rb') as src, open(key_path, 'rb') as key:
+        header = src.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE or not header.startswith(HEADER_MAGIC):
+            raise ValueError(f"{in_path} is not an OTP file")
+        offset = int.from_bytes(header[4:12], 'little')
+        length = int.from_bytes(header[12:20], 'little')
+        key.seek(offset)
+        out_file, out = _preallocated_map(out_path, length)
+        try:
+            if out is not None:
+                _xor_stream(src, key, out, 0, length, chunk_size)
+                out.flush()
+        finally:
+            if out is not None:
+                out.close()
+            out_file.close()
+
+
+# ---------------------------------------------------------------------------
+# Pad-reuse audit
+#
+# Under a reused pad the aligned differences c1 - c2 (mod 26) or c1 ^ c2 are
+# differences of two English texts, which are far from uniform (0 is the most
+# common, and for bytes the high bits cancel); under independent pads they are
+# uniform. A log-likelihood ratio for every pair comes from one matrix
+# product per symbol value, and pairs far above chance are flagged. For a
+# flagged pair, d = c1 - c2 (mod 26) or c1 ^ c2 equals p1 - p2 or p1 ^ p2, so
+# a guessed word (crib) in one plaintext reveals the other; every crib of a
+# given length is tried at every offset at once.
+# Both steps need NumPy.
+# ---------------------------------------------------------------------------
+ENGLISH_FREQ = {
+    'A': 8.17, 'B': 1.49, 'C': 2.78, 'D': 4.25, 'E': 12.70, 'F': 2.23, 'G': 2.02,
+    'H': 6.09, 'I': 6.97, 'J': 0.15, 'K': 0.77, 'L': 4.03, 'M': 2.41, 'N': 6.75,
+    'O': 7.51, 'P': 1.93, 'Q': 0.10, 'R': 5.99, 'S': 6.33, 'T': 9.06, 'U': 2.76,
+    'V': 0.98, 'W': 2.36, 'X': 0.15, 'Y': 1.97, 'Z': 0.07
+}
+MODE_SIZES = {"mod26": 26, "bytes": 256}
+COMMON_CRIBS = ["THE", "AND", "THAT", "WITH", "HAVE", "THIS", "FROM", "ATTACK",
+                "SECRET", "MESSAGE", "MEETING", "TOMORROW"]
+
+
+def _need_numpy():
+    if np is None:
+        raise ImportError("the pad-reuse audit needs numpy")
+
+
+def _symbols(ciphertext, mode):
+    """Ciphertext as an int array: A-Z -> 0..25 ('mod26') or byte values ('bytes')."""
+    if mode == "mod26":
+        data = np.frombuffer(ciphertext.upper().encode('ascii', 'ignore'), np.uint8)
+        return data[(data >= 65) & (data <= 90)].astype(np.int16) - 65
+    if mode == "bytes":
+        return np.frombuffer(bytes(ciphertext), np.uint8).astype(np.int16)
+    raise ValueError(f"unknown mode: {mode!r}")
+
+
+def _log_probs(mode):
+    """log10 probability of each plaintext symbol under a rough English model."""
+    if mode == "mod26":
+        return np.log10(np.array([ENGLISH_FREQ[c] for c in string.ascii_uppercase]) / 100)
+    weights = np.full(256, 0.001)
+    weights[0x20] = 18.0                           # space
+    weights[ord('\n')] = 1.0
+    for c, f in ENGLISH_FREQ.items():
+        weights[ord(c.lower())] = f
+        weights[ord(c)] = f * 0.05
+    for c in ".,;:'\"!?-()0123456789":
+        weights[ord(c)] = 0.3
+    return np.log10(weights / weights.sum())
+
+
+def _bigram_log_probs():
+    """Bigram log10 table from ngram_tables.py as a NumPy array, or None."""
+    try:
+        import ngram_tables
+    except ImportError:
+        return None
+    if not ngram_tables.tables_available(2):
+        return None
+    return ngram_tables.load_table(2).as_array().astype(np.float64)
+
+
+def difference_weights(mode="mod26"):
+    """
+    Log-likelihood ratio (natural log) of each difference value d = c1 - c2
+    (mod 26) or c1 ^ c2 under "same pad, English plaintexts" against "different
+    pads" (uniform d). Same-pad differences follow Q(d) = sum_x P(x) P(x - d).
+    """
+    probs = 10.0 ** _log_probs(mode)
+    size = MODE_SIZES[mode]
+    x = np.arange(size)
+    if mode == "mod26":
+        q = np.array([(probs * probs[(x - d) % size]).sum() for d in range(size)])
+    else:
+        q = np.array([(probs * probs[x ^ d]).sum() for d in range(size)])
+    return np.log(q / q.sum() * size)
+
+
+def pair_statistics(ciphertexts, mode="mod26"):
+    """
+    Returns (llr, overlap): llr[i, j] is the summed difference_weights of the
+    aligned symbols of ciphertexts i and j, over overlap[i, j] positions.
+    Computed as one (N x L) @ (L x N) product per symbol value u: the one-hot
+    rows of u against the weights of (u - symbol) of every other ciphertext.
+    """
+    _need_numpy()
+    arrays = [_symbols(c, mode) for c in ciphertexts]
+    lengths = np.array([len(a) for a in arrays])
+    width = int(lengths.max()) if len(arrays) else 0
+    matrix = np.zeros((len(arrays), width), dtype=np.int16)
+    valid = np.zeros((len(arrays), width), dtype=bool)
+    for row, mask, a in zip(matrix, valid, arrays):
+        row[:len(a)] = a
+        mask[:len(a)] = True
+    weights = difference_weights(mode).astype(np.float32)
+    size = MODE_SIZES[mode]
+    llr = np.zeros((len(arrays), len(arrays)), dtype=np.float64)
+    for u in np.unique(matrix[valid]):
+        onehot = ((matrix == u) & valid).astype(np.float32)
+        diffs = (u - matrix) % size if mode == "mod26" else (u ^ matrix)
+        llr += onehot @ (weights[diffs] * valid).T
+    return llr, np.minimum.outer(lengths, lengths)
+
+
+def find_reused_pads(ciphertexts, mode="mod26", z_threshold=5.0, min_overlap=20):
+    """
+    Flag pairs of ciphertexts that look encrypted under the same pad.
+    The pair statistic is compared with its mean and spread over independent
+    pads (uniform differences). Returns [(i, j, llr per symbol, z-score), ...],
+    most suspicious first.
+    Byte mode separates reused pads after a few dozen bytes. A-Z text carries
+    much less signal per letter (only the letter frequencies differ from
+    uniform), so reuse stands out reliably only with several hundred letters
+    of overlap; shorter pairs rank high but rarely pass z_threshold.
+    """
+    llr, overlap = pair_statistics(ciphertexts, mode)
+    weights = difference_weights(mode)
+    mean, var = weights.mean(), weights.var()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (llr - overlap * mean) / np.sqrt(overlap * var)
+        per_symbol = llr / overlap
+    i, j = np.nonzero(np.triu((z >= z_threshold) & (overlap >= min_overlap), k=1))
+    order = np.argsort(-z[i, j], kind='stable')
+    return [(int(a), int(b), float(per_symbol[a, b]), float(z[a, b]))
+            for a, b in zip(i[order], j[order])]
+
+
+def crib_drag(c1, c2, cribs=COMMON_CRIBS, mode="mod26", top_k=20):
+    """
+    Try every crib at every offset of a suspected pad-reuse pair.
+    A crib placed in one plaintext gives a fragment of the other; fragments
+    are scored as log10 likelihood ratio of English against random symbols
+    (from the bigram table of ngram_tables.py for A-Z when it is trained,
+    else from letter frequencies).
+    Returns [(score, crib, offset, side, fragment), ...], best first; side 1
+    means the crib is in c1's plaintext and the fragment is c2's, side 2 the
+    reverse, and side 0 (XOR) that it can be either.
+    """
+    _need_numpy()
+    a, b = _symbols(c1, mode), _symbols(c2, mode)
+    n = min(len(a), len(b))
+    size = MODE_SIZES[mode]
+    diff = (a[:n] - b[:n]) % 26 if mode == "mod26" else a[:n] ^ b[:n]
+    log_probs = _log_probs(mode)
+    baseline = np.log10(size)
+    bigrams = _bigram_log_probs() if mode == "mod26" else None
+    by_length = {}
+    for crib in cribs:
+        word = _symbols(crib if mode == "mod26" else crib.encode(), mode)
+        if 0 < len(word) <= n:
+            by_length.setdefault(len(word), []).append((crib, word))
+
+    hits = []
+    for length, group in by_length.items():
+        words = np.stack([w for _, w in group])                         # (cribs, length)
+        windows = np.lib.stride_tricks.sliding_window_view(diff, length)  # (offsets, length)
+        for side in ((1, 2) if mode == "mod26" else (0,)):
+            if mode == "mod26":
+                # p1 - p2 = d: crib as p1 gives p2 = p1 - d, crib as p2 gives p1 = p2 + d
+                frags = (words[:, None, :] - windows[None] if side == 1
+                         else words[:, None, :] + windows[None]) % 26
+            else:
+                frags = words[:, None, :] ^ windows[None]
+            if bigrams is not None and length > 1:
+                scores = (bigrams[frags[:, :, :-1] * 26 + frags[:, :, 1:]].sum(axis=2)
+                          + (length - 1) * 2 * baseline)
+            else:
+                scores = log_probs[frags].sum(axis=2) + length * baseline  # (cribs, offsets)
+            best = np.argsort(scores, axis=None)[::-1][:top_k]
+            for w, off in zip(*np.unravel_index(best, scores.shape)):
+                frag = frags[w, off]
+                text = ("".join(chr(65 + int(x)) for x in frag) if mode == "mod26"
+                        else bytes(frag.astype(np.uint8)).decode('latin-1'))
+                hits.append((float(scores[w, off]), group[w][0], int(off), side, text))
+    hits.sort(key=lambda h: -h[0])
+    return hits[:top_k]
+
+
+def audit_pads(ciphertexts, cribs=COMMON_CRIBS, mode="mod26", z_threshold=5.0, top_k=10):
+    """find_reused_pads, then crib_drag on each flagged pair: [((i, j, rate, z), hits), ...]"""
+    report = []
+    for pair in find_reused_pads(ciphertexts, mode, z_threshold):
+        i, j = pair[0], pair[1]
+        report.append((pair, crib_drag(ciphertexts[i], ciphertexts[j], cribs, mode, top_k)))
+    return report
+
+
 # --- Main program ---
-plaintext = "HELLO THIS IS A SECRET MESSAGE"
+if __name__ == "__main__":
+    plaintext = "HELLO THIS IS A SECRET MESSAGE"
+
+    # Generate a random key stream
+    key = generate_key(len(plaintext.replace(" ", "")))
 
-# Generate a random key stream
-key = generate_key(len(plaintext.replace(" ", "")))
+    print("Plaintext:", plaintext)
+    print("Random key stream:", key)
 
-print("Plaintext:", plaintext)
-print("Random key stream:", key)
+    # Encrypt
+    ciphertext = encrypt_otp(plaintext, key)
+    print("Ciphertext:", ciphertext)
 
-# Encrypt
-ciphertext = encrypt_otp(plaintext, key)
-print("Ciphertext:", ciphertext)
+    # Decrypt
+    decrypted = decrypt_otp(ciphertext, key)
+    print("Decrypted Plaintext:", decrypted)
 
-# Decrypt
-decrypted = decrypt_otp(ciphertext, key)
-print("Decrypted Plaintext:", decrypted)
+    # File mode: python3 "crypt lab 14.py" keygen <key> <bytes>
+    #            python3 "crypt lab 14.py" encrypt|decrypt <in> <key> <out>
+    if len(sys.argv) == 4 and sys.argv[1] == "keygen":
+        write_key_file(sys.argv[2], int(sys.argv[3]))
+        print(f"Wrote {sys.argv[3]} random key bytes to {sys.argv[2]}")
+    elif len(sys.argv) == 5 and sys.argv[1] == "encrypt":
+        used = encrypt_otp_file(sys.argv[2], sys.argv[3], sys.argv[4])
+        print(f"Encrypted {sys.argv[2]} with key bytes from offset {used}")
+    elif len(sys.argv) == 5 and sys.argv[1] == "decrypt":
+        decrypt_otp_file(sys.argv[2], sys.argv[3], sys.argv[4])
+        print(f"Decrypted {sys.argv[2]} -> {sys.argv[4]}")
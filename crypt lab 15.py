@@ -34,16 +34,97 @@ def score_text(text):
         chi_sq += ((observed - expected) ** 2) / expected
     return chi_sq
 
+# Letter counts A..Z of text (one pass)
+def letter_histogram(text):
+    counts = [0] * 26
+    for c in text.upper():
+        if 'A' <= c <= 'Z':
+            counts[ord(c) - ord('A')] += 1
+    return counts
+
+# Chi-square score of every key 0..25, from one histogram of the ciphertext.
+# Decrypting with key k turns cipher letter (L + k) % 26 into plain letter L,
+# so the histogram of each candidate plaintext is just the ciphertext histogram
+# rotated by k; nothing is decrypted.
+def shift_scores(counts):
+    total = sum(counts)
+    if total == 0:
+        return [float('inf')] * 26
+    scores = []
+    for key in range(26):
+        chi_sq = 0
+        for i, letter in enumerate(string.ascii_uppercase):
+            observed = counts[(i + key) % 26] * 100 / total
+            expected = ENGLISH_FREQ[letter]
+            chi_sq += ((observed - expected) ** 2) / expected
+        scores.append(chi_sq)
+    return scores
+
+# Letter counts of many messages at once: (messages x 26) NumPy array
+def batch_histograms(ciphertexts):
+    import numpy as np
+    if not ciphertexts:
+        return np.zeros((0, 26), dtype=np.int64)
+    encoded = [t.upper().encode('ascii', 'ignore') for t in ciphertexts]
+    lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    owner = np.repeat(np.arange(len(encoded)), lengths)
+    letters = (data >= ord('A')) & (data <= ord('Z'))
+    cells = owner[letters] * 26 + (data[letters] - ord('A'))
+    return np.bincount(cells, minlength=len(encoded) * 26).reshape(len(encoded), 26)
+
+# Chi-square of all 26 keys for many messages: one (messages x 26) matrix.
+# sum_L (O - E)^2 / E = sum_L O^2 / E - 2 * sum O + sum E with sum O = 100,
+# and sum_L O[(L + k) % 26]^2 / E[L] for every k is one product with a
+# 26 x 26 matrix of rotated 1/E values.
+def batch_shift_scores(counts):
+    import numpy as np
+    counts = np.asarray(counts, dtype=np.float64)
+    expected = np.array([ENGLISH_FREQ[c] for c in string.ascii_uppercase])
+    totals = counts.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        observed = counts * 100 / totals
+    cipher, key = np.meshgrid(np.arange(26), np.arange(26), indexing='ij')
+    rotated_inv = 1.0 / expected[(cipher - key) % 26]      # [cipher letter, key]
+    scores = (observed ** 2) @ rotated_inv - 200 + expected.sum()
+    scores[totals[:, 0] == 0] = np.inf
+    return scores
+
+# Crack many Caesar ciphertexts at once.
+# Returns (best_keys, top_keys): best_keys[m] is the lowest chi-square key of
+# message m; top_keys is a (messages x top_n) array of keys, best first, or
+# None when top_n is not given.
+def batch_frequency_attack(ciphertexts, top_n=None):
+    import numpy as np
+    scores = batch_shift_scores(batch_histograms(ciphertexts))
+    best_keys = np.argmin(scores, axis=1)
+    top_keys = None
+    if top_n:
+        top_keys = np.argsort(scores, axis=1, kind='stable')[:, :top_n]
+    return best_keys, top_keys
+
+# Quadgram score (negated log-probability, so lower is better like score_text)
+# Needs tables trained with ngram_tables.py
+def score_text_quadgram(text):
+    import ngram_tables
+    return -ngram_tables.load_table(4).score(text)
+
 # Function to perform frequency attack
-def frequency_attack(ciphertext, top_n=10):
+# scorer=None scores all keys from one histogram (same values as score_text)
+def frequency_attack(ciphertext, top_n=10, scorer=None):
     print("Ciphertext:", ciphertext)
     print(f"\nPerforming letter frequency attack... (Top {top_n} results)\n")
 
-    results = []
-    for key in range(26):
-        plaintext = decrypt(ciphertext, key)
-        score = score_text(plaintext)
-        results.append((key, score, plaintext))
+    if scorer is None:
+        scores = shift_scores(letter_histogram(ciphertext))
+        ranked = sorted(range(26), key=lambda k: scores[k])[:top_n]
+        results = [(key, scores[key], decrypt(ciphertext, key)) for key in ranked]
+    else:
+        results = []
+        for key in range(26):
+            plaintext = decrypt(ciphertext, key)
+            score = scorer(plaintext)
+            results.append((key, score, plaintext))
 
     # Sort results by best (lowest chi-square score)
     results.sort(key=lambda x: x[1])
@@ -53,8 +134,22 @@ def frequency_attack(ciphertext, top_n=10):
     for i, (key, score, plaintext) in enumerate(results[:top_n], start=1):
         print(f"{i:<5} {key:<5} {score:<10.3f} {plaintext}")
 
+# Batch mode: one ciphertext per line of a file, prints the best key per line
+def batch_main(path, top_n=3):
+    with open(path, 'r', encoding='utf-8') as f:
+        ciphertexts = f.read().splitlines()
+    best_keys, top_keys = batch_frequency_attack(ciphertexts, top_n)
+    for line, (ciphertext, key) in enumerate(zip(ciphertexts, best_keys), start=1):
+        others = " ".join(str(k) for k in top_keys[line - 1])
+        print(f"{line:<6} key={key:<3} top=[{others}]  {decrypt(ciphertext, int(key))}")
+
 # --- Main Program ---
-ciphertext = input("Enter the ciphertext: ").upper().strip()
-top_n = int(input("Enter how many possible plaintexts to display (e.g. 10): "))
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 2 and sys.argv[1] == "--batch":
+        batch_main(sys.argv[2])
+    else:
+        ciphertext = input("Enter the ciphertext: ").upper().strip()
+        top_n = int(input("Enter how many possible plaintexts to display (e.g. 10): "))
 
-frequency_attack(ciphertext, top_n)
+        frequency_attack(ciphertext, top_n)
@@ -1,22 +1,28 @@
 #!/usr/bin/env python3
 """
-Automatic monoalphabetic substitution solver (hill-climb + frequency heuristics).
+Automatic monoalphabetic substitution solver (hill-climb or simulated annealing
++ frequency heuristics).
 
 Usage:
   - Run: python3 monoattack.py
   - Paste ciphertext at the prompt (or give a filename when asked).
-  - Choose how many top candidates to show and how many random restarts.
+  - Choose how many top candidates to show, how many random restarts, how
+    many worker processes to spread the restarts over, and the optimizer
+    (greedy hill-climb or simulated annealing).
+  - Benchmark the two optimizers: python3 monoattack.py --benchmark [--quadgram]
 
 Notes:
   - Works best on reasonably long ciphertexts (hundreds of letters).
-  - If you'd like better accuracy, I can add quadgram scoring (needs a data file
-    or embedded table) or simulated annealing.
+  - For better accuracy, train quadgram tables (python3 ngram_tables.py corpus.txt)
+    and answer yes to the quadgram fitness prompt.
 """
 
 import sys
 import math
+import multiprocessing
 import random
 import re
+import time
 from collections import Counter
 
 # ---- Configuration / heuristics ----
@@ -36,6 +42,14 @@ WEIGHT_CHI = 0.5    # chi-square is *penalized* (lower chi is better)
 
 ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
 
+# expected percentages for English (approx)
+ENGLISH_FREQ = {
+    'A':8.167,'B':1.492,'C':2.782,'D':4.253,'E':12.702,'F':2.228,'G':2.015,'H':6.094,
+    'I':6.966,'J':0.153,'K':0.772,'L':4.025,'M':2.406,'N':6.749,'O':7.507,'P':1.929,
+    'Q':0.095,'R':5.987,'S':6.327,'T':9.056,'U':2.758,'V':0.978,'W':2.360,'X':0.150,
+    'Y':1.974,'Z':0.074
+}
+
 # ---- Utility functions ----
 
 def clean_text(s):
@@ -120,112 +134,526 @@ def score_plaintext(plaintext):
     # compute observed % frequencies
     observed = Counter(up)
     n = len(up) if len(up) > 0 else 1
-    # expected percentages for English (approx)
-    english_freq = {
-        'A':8.167,'B':1.492,'C':2.782,'D':4.253,'E':12.702,'F':2.228,'G':2.015,'H':6.094,
-        'I':6.966,'J':0.153,'K':0.772,'L':4.025,'M':2.406,'N':6.749,'O':7.507,'P':1.929,
-        'Q':0.095,'R':5.987,'S':6.327,'T':9.056,'U':2.758,'V':0.978,'W':2.360,'X':0.150,
-        'Y':1.974,'Z':0.074
-    }
     chi = 0.0
     for letter in ALPHABET:
         obs = (observed.get(letter,0) * 100.0) / n
-        exp = english_freq[letter]
+        exp = ENGLISH_FREQ[letter]
         chi += ((obs - exp) ** 2) / (exp if exp > 0 else 1.0)
     # smaller chi -> better: subtract weighted chi
     score -= WEIGHT_CHI * chi
     return score
 
+# ---- Incremental scoring engine ----
+def build_digraph_weights():
+    """Return a 26x26 weight table: WEIGHT_DIGRAPH for COMMON_DIGRAPHS, else 0."""
+    weights = [[0.0] * 26 for _ in range(26)]
+    for dg in COMMON_DIGRAPHS:
+        weights[ord(dg[0]) - 65][ord(dg[1]) - 65] = WEIGHT_DIGRAPH
+    return weights
+
+def _inverse(key):
+    """Inverse of a key list: result[plain_index] = cipher_index."""
+    inverse = [0] * 26
+    for c, p in enumerate(key):
+        inverse[p] = c
+    return inverse
+
+def _letter_pattern(gram):
+    """Repetition pattern of a sequence, e.g. THAT and (1, 5, 2, 1) -> (0, 1, 2, 0)."""
+    first = {}
+    return tuple(first.setdefault(c, len(first)) for c in gram)
+
+class SwapScorer:
+    """
+    Scores substitution keys from n-gram counts of the ciphertext.
+    The ciphertext is encoded once into a 26-entry unigram count list and a
+    26x26 bigram count matrix (letters only, like clean_text). The fitness of a
+    key is score_plaintext: digraphs + chi-square from the count matrices, and
+    the COMMON_WORDS bonus from the distinct cipher n-grams (within runs of
+    letters) that can decrypt to a common word. A swap only touches the two
+    affected rows and columns and the n-grams containing a swapped letter, so
+    swap_delta never looks at the ciphertext again.
+    Keys are lists of ints: key[cipher_index] = plain_index.
+    """
+
+    def __init__(self, ciphertext, bigram_weights=None):
+        idx = [ord(c) - 65 for c in clean_text(ciphertext)]
+        self.n = len(idx) if idx else 1
+        self.unigrams = [0] * 26
+        for c in idx:
+            self.unigrams[c] += 1
+        self.bigrams = [[0] * 26 for _ in range(26)]
+        for a, b in zip(idx, idx[1:]):
+            self.bigrams[a][b] += 1
+        self.weights = bigram_weights or build_digraph_weights()
+        self.expected = [ENGLISH_FREQ[ch] for ch in ALPHABET]
+        # only non-zero bigrams matter; keep them per row and per column
+        self.rows = [[(b, cnt) for b, cnt in enumerate(self.bigrams[a]) if cnt]
+                     for a in range(26)]
+        self.cols = [[(a, self.bigrams[a][b]) for a in range(26) if self.bigrams[a][b]]
+                     for b in range(26)]
+        self._init_words(ciphertext)
+
+    def _init_words(self, ciphertext):
+        # Word counts are looked up from the other side: a key decrypts a cipher
+        # n-gram to a common word exactly when the inverse key encrypts the word
+        # to that n-gram. A substitution keeps the pattern of repeated letters,
+        # so only n-grams with the pattern of some common word are kept.
+        # Occurrences are counted with overlaps, unlike str.count; no common
+        # word overlaps itself in practice.
+        self.words = [tuple(ord(c) - 65 for c in w.strip().upper()) for w in COMMON_WORDS]
+        self.words_with = [[w for w in self.words if p in w] for p in range(26)]
+        patterns = {_letter_pattern(w) for w in self.words}
+        sizes = {len(w) for w in self.words}
+        grams = Counter()
+        runs = "".join(ch if ch.isalpha() else " " for ch in ciphertext.upper()).split()
+        for run in runs:
+            idx = [ord(c) - 65 for c in run]
+            for size in sizes:
+                for k in range(len(idx) - size + 1):
+                    grams[tuple(idx[k:k + size])] += 1
+        self.word_grams = {g: cnt for g, cnt in grams.items() if _letter_pattern(g) in patterns}
+
+    def _word_count(self, inverse, words):
+        """Occurrences of words (plain letter tuples) under the inverse key."""
+        grams, cipher = self.word_grams, inverse.__getitem__
+        return sum(grams.get(tuple(map(cipher, w)), 0) for w in words)
+
+    def _chi_term(self, count, plain):
+        obs = count * 100.0 / self.n
+        exp = self.expected[plain]
+        return ((obs - exp) ** 2) / exp
+
+    def score(self, key):
+        """Full fitness of key (list of ints)."""
+        w = self.weights
+        total = 0.0
+        for a in range(26):
+            wa = w[key[a]]
+            for b, cnt in self.rows[a]:
+                total += cnt * wa[key[b]]
+        chi = 0.0
+        for c in range(26):
+            chi += self._chi_term(self.unigrams[c], key[c])
+        words = self._word_count(_inverse(key), self.words)
+        return WEIGHT_WORD * words + total - WEIGHT_CHI * chi
+
+    def swap_delta(self, key, i, j):
+        """Change in score() if key[i] and key[j] were swapped."""
+        w = self.weights
+        ki, kj = key[i], key[j]
+
+        def new(x):
+            return kj if x == i else ki if x == j else key[x]
+
+        delta = 0.0
+        # rows i and j: every bigram starting with a swapped cipher letter
+        for a in (i, j):
+            old_row, new_row = w[key[a]], w[new(a)]
+            for b, cnt in self.rows[a]:
+                delta += cnt * (new_row[new(b)] - old_row[key[b]])
+        # columns i and j, skipping cells already counted in the rows above
+        for b in (i, j):
+            kb, nb = key[b], new(b)
+            for a, cnt in self.cols[b]:
+                if a == i or a == j:
+                    continue
+                wa = w[key[a]]
+                delta += cnt * (wa[nb] - wa[kb])
+        chi_delta = (self._chi_term(self.unigrams[i], kj) + self._chi_term(self.unigrams[j], ki)
+                     - self._chi_term(self.unigrams[i], ki) - self._chi_term(self.unigrams[j], kj))
+        # only words holding plain letter ki or kj are encrypted differently
+        touched = self.words_with[ki] + [w for w in self.words_with[kj] if ki not in w]
+        inverse = _inverse(key)
+        swapped = list(inverse)
+        swapped[ki], swapped[kj] = j, i
+        word_delta = self._word_count(swapped, touched) - self._word_count(inverse, touched)
+        return WEIGHT_WORD * word_delta + delta - WEIGHT_CHI * chi_delta
+
+    def rank_score(self, key, plain):
+        """Score used to rank finished candidates."""
+        return score_plaintext(plain)
+
+class QuadgramScorer:
+    """
+    Same interface as SwapScorer, but the fitness is the sum of corpus-trained
+    quadgram log-probabilities (see ngram_tables.py). The distinct cipher
+    quadgrams are counted once and indexed by letter, so a swap only revisits
+    the quadgrams that contain one of the two swapped cipher letters.
+    """
+
+    def __init__(self, ciphertext, table=None):
+        if table is None:
+            import ngram_tables
+            table = ngram_tables.load_table(4)
+        self.values = table.values
+        idx = [ord(c) - 65 for c in clean_text(ciphertext)]
+        self.quads = list(Counter(zip(idx, idx[1:], idx[2:], idx[3:])).items())
+        self.by_letter = [[] for _ in range(26)]
+        for quad, cnt in self.quads:
+            for c in set(quad):
+                self.by_letter[c].append((quad, cnt))
+
+    def _sum(self, key, quads):
+        values = self.values
+        total = 0.0
+        for (a, b, c, d), cnt in quads:
+            total += cnt * values[((key[a] * 26 + key[b]) * 26 + key[c]) * 26 + key[d]]
+        return total
+
+    def score(self, key):
+        return self._sum(key, self.quads)
+
+    def swap_delta(self, key, i, j):
+        touched = self.by_letter[i] + [q for q in self.by_letter[j] if i not in q[0]]
+        new = list(key)
+        new[i], new[j] = new[j], new[i]
+        return self._sum(new, touched) - self._sum(key, touched)
+
+    def rank_score(self, key, plain):
+        return self.score(key)
+
+def make_scorer(ciphertext, fitness="heuristic"):
+    """fitness: 'heuristic' (digraphs + chi-square) or 'quadgram' (ngram_tables)."""
+    if fitness == "quadgram":
+        return QuadgramScorer(ciphertext)
+    if fitness == "heuristic":
+        return SwapScorer(ciphertext)
+    raise ValueError(f"unknown fitness: {fitness!r}")
+
+def key_to_list(key):
+    return [ord(ch) - 65 for ch in key]
+
+def list_to_key(key_list):
+    return "".join(ALPHABET[x] for x in key_list)
+
 # ---- Key operations ----
 def swap_key(key, i, j):
     k = list(key)
     k[i], k[j] = k[j], k[i]
     return "".join(k)
 
-def randomize_key(key, swaps=10):
+def randomize_key(key, swaps=10, rng=random):
     k = list(key)
     for _ in range(swaps):
-        i = random.randrange(26)
-        j = random.randrange(26)
+        i = rng.randrange(26)
+        j = rng.randrange(26)
         k[i], k[j] = k[j], k[i]
     return "".join(k)
 
 # ---- Hill-climbing optimizer ----
-def hill_climb(ciphertext, start_key, max_no_improve=1000):
+def hill_climb(ciphertext, start_key, scorer=None):
     """
     Greedy hill-climb by trying all pairwise swaps and keeping improving swaps.
-    Returns (best_key, best_score).
+    Swaps are judged with SwapScorer.swap_delta, so a sweep costs O(26^2)
+    regardless of ciphertext length; the plaintext is only built for the final key.
+    A sweep without any improving swap is a local optimum (the scorer is
+    deterministic), so the climb stops there.
+    Returns (best_key, best_score, best_plain); best_score is scorer.rank_score.
     """
-    best_key = start_key
-    best_plain = apply_key(ciphertext, best_key)
-    best_score = score_plaintext(best_plain)
+    if scorer is None:
+        scorer = SwapScorer(ciphertext)
+    key = key_to_list(start_key)
 
-    no_improve = 0
-    iteration = 0
-    # try repeated sweeps of all pairs until no improvement for a while
-    while no_improve < max_no_improve:
+    while True:
         improved = False
-        iteration += 1
         # try all unordered pairs (i<j)
         for i in range(26):
             for j in range(i+1, 26):
-                cand_key = swap_key(best_key, i, j)
-                cand_plain = apply_key(ciphertext, cand_key)
-                cand_score = score_plaintext(cand_plain)
-                if cand_score > best_score + 1e-9:
-                    best_key = cand_key
-                    best_score = cand_score
-                    best_plain = cand_plain
-                    improved = True
+                if scorer.swap_delta(key, i, j) > 1e-9:
                     # Apply immediate switch and continue searching from new key
+                    key[i], key[j] = key[j], key[i]
+                    improved = True
         if not improved:
-            no_improve += 1
-        else:
-            no_improve = 0
-    return best_key, best_score, best_plain
+            break
 
-# ---- Main attack routine ----
-def attack(ciphertext, top_n=10, restarts=200, random_seed=None):
-    if random_seed is not None:
-        random.seed(random_seed)
+    best_key = list_to_key(key)
+    best_plain = apply_key(ciphertext, best_key)
+    return best_key, scorer.rank_score(key, best_plain), best_plain
+
+# ---- Simulated-annealing optimizer ----
+ANNEAL_ITERATIONS = 20000
+ANNEAL_SCHEDULES = ("exponential", "linear")
+
+def anneal_temperature(step, iterations, t_start, t_end, schedule="exponential"):
+    """Temperature at step (0 <= step < iterations) of the given schedule."""
+    frac = step / max(1, iterations - 1)
+    if schedule == "exponential":
+        return t_start * (t_end / t_start) ** frac
+    if schedule == "linear":
+        return t_start + (t_end - t_start) * frac
+    raise ValueError(f"unknown schedule: {schedule!r} (use one of {ANNEAL_SCHEDULES})")
+
+def calibrate_temperature(scorer, key, rng=random, samples=100):
+    """Mean |score change| of random swaps around key, used as the default t_start."""
+    total = 0.0
+    for _ in range(samples):
+        i, j = rng.sample(range(26), 2)
+        total += abs(scorer.swap_delta(key, i, j))
+    return total / samples or 1.0
+
+def simulated_annealing(ciphertext, start_key, scorer=None, iterations=ANNEAL_ITERATIONS,
+                        t_start=None, t_end=None, schedule="exponential", rng=random):
+    """
+    Simulated annealing over random key swaps. A swap that raises the score is
+    always taken; one that lowers it by d is taken with probability exp(-d/T).
+    t_start defaults to the mean score change of a random swap at start_key
+    (so it works for both fitness functions) and t_end to t_start / 1000;
+    both must be positive.
+    The best key seen is finished with hill_climb.
+    Returns (best_key, best_score, best_plain) like hill_climb.
+    """
+    if scorer is None:
+        scorer = make_scorer(ciphertext)
+    key = key_to_list(start_key)
+    if t_start is None:
+        t_start = calibrate_temperature(scorer, key, rng)
+    if t_end is None:
+        t_end = t_start / 1000.0
+    if not (t_start > 0 and t_end > 0):
+        raise ValueError(f"temperatures must be positive, got t_start={t_start}, t_end={t_end}")
+
+    current = scorer.score(key)
+    best, best_list = current, list(key)
+    for step in range(iterations):
+        temp = anneal_temperature(step, iterations, t_start, t_end, schedule)
+        i, j = rng.sample(range(26), 2)
+        delta = scorer.swap_delta(key, i, j)
+        if delta >= 0 or rng.random() < math.exp(delta / temp):
+            key[i], key[j] = key[j], key[i]
+            current += delta
+            if current > best:
+                best, best_list = current, list(key)
+    return hill_climb(ciphertext, list_to_key(best_list), scorer=scorer)
+
+# ---- Restarts ----
+def run_restart(ciphertext, scorer, initial_key, attempt, rng=random,
+                optimizer="hill", anneal_options=None):
+    """
+    One random restart. With optimizer='hill' it is a hill_climb plus two small
+    perturbation climbs from its result; with optimizer='anneal' it is a single
+    simulated_annealing run (anneal_options are passed through to it).
+    rng is the random source (the random module or a random.Random).
+    Returns a list of (score, key, plain) in the order they were found.
+    """
+    if attempt % 5 == 0:
+        # sometimes try fully random key
+        letters = list(ALPHABET)
+        rng.shuffle(letters)
+        start = "".join(letters)
     else:
-        random.seed()
+        # randomize initial key by a few swaps
+        start = randomize_key(initial_key, swaps=1 + rng.randrange(12), rng=rng)
+
+    if optimizer == "anneal":
+        k, s, p = simulated_annealing(ciphertext, start, scorer=scorer, rng=rng,
+                                      **(anneal_options or {}))
+        return [(s, k, p)]
+    if optimizer != "hill":
+        raise ValueError(f"unknown optimizer: {optimizer!r}")
+
+    k, s, p = hill_climb(ciphertext, start, scorer=scorer)
+    found = [(s, k, p)]
+
+    # small local perturbations from this best
+    for extra in range(2):
+        start2 = randomize_key(k, swaps=1 + rng.randrange(6), rng=rng)
+        k2, s2, p2 = hill_climb(ciphertext, start2, scorer=scorer)
+        found.append((s2, k2, p2))
+    return found
+
+def add_candidate(candidates, score, key, plain):
+    """Append to candidates unless the same plaintext is already there."""
+    if not any(c['plain'] == plain for c in candidates):
+        candidates.append({'score': score, 'key': key, 'plain': plain})
+
+def derive_worker_seeds(random_seed, workers):
+    """One seed per worker; fixed for a given random_seed and worker count."""
+    if random_seed is None:
+        return [random.SystemRandom().getrandbits(64) for _ in range(workers)]
+    master = random.Random(random_seed)
+    return [master.getrandbits(64) for _ in range(workers)]
 
+# ---- Multi-core restart scheduler ----
+# Worker-process state, set once per process by _init_worker.
+_worker = {}
+
+def _init_worker(ciphertext, fitness, stop_at):
+    _worker['ciphertext'] = ciphertext
+    _worker['scorer'] = make_scorer(ciphertext, fitness)
+    _worker['stop_at'] = stop_at
+
+def _worker_restarts(args):
+    """
+    Run restarts worker, worker+workers, ... with this worker's own rng.
+    A restart is skipped once a lower-numbered restart has reached the target
+    (stop_at) or the deadline has passed. Returns [(attempt, found), ...].
+    """
+    (worker, workers, restarts, seed, initial_key, target_score, deadline,
+     optimizer, anneal_options) = args
+    rng = random.Random(seed)
+    stop_at = _worker['stop_at']
+    results = []
+    for attempt in range(worker, restarts, workers):
+        if attempt > stop_at.value:
+            break
+        if deadline is not None and time.time() >= deadline:
+            break
+        found = run_restart(_worker['ciphertext'], _worker['scorer'], initial_key, attempt, rng,
+                            optimizer, anneal_options)
+        results.append((attempt, found))
+        top = max(f[0] for f in found)
+        if target_score is not None and top >= target_score:
+            with stop_at.get_lock():
+                if attempt < stop_at.value:
+                    stop_at.value = attempt
+    return results
+
+def parallel_restarts(ciphertext, initial_key, restarts, random_seed, fitness,
+                      workers, target_score=None, deadline=None,
+                      optimizer="hill", anneal_options=None):
+    """
+    Spread restarts over a process pool. Restart a is always run by worker
+    a % workers with that worker's seed, and results from restarts after the
+    first one that reached target_score are dropped, so the output only depends
+    on random_seed and workers (unless the wall-clock deadline cuts it short).
+    Returns (score, key, plain) tuples ordered by restart number.
+    """
+    seeds = derive_worker_seeds(random_seed, workers)
+    stop_at = multiprocessing.Value('q', restarts)   # lowest restart that reached target_score
+    jobs = [(w, workers, restarts, seeds[w], initial_key, target_score, deadline,
+             optimizer, anneal_options)
+            for w in range(workers)]
+    with multiprocessing.Pool(workers, initializer=_init_worker,
+                              initargs=(ciphertext, fitness, stop_at)) as pool:
+        chunks = pool.map(_worker_restarts, jobs)
+    results = [r for chunk in chunks for r in chunk if r[0] <= stop_at.value]
+    results.sort(key=lambda r: r[0])
+    return [f for _, found in results for f in found]
+
+# ---- Main attack routine ----
+def attack(ciphertext, top_n=10, restarts=200, random_seed=None, fitness="heuristic",
+           workers=1, target_score=None, time_budget=None,
+           optimizer="hill", anneal_options=None):
+    """
+    Run the deterministic climb plus random restarts and return the top_n
+    candidates. With workers > 1 the restarts run in a process pool (see
+    parallel_restarts). Restarts stop early once a candidate scores at least
+    target_score, or after time_budget seconds of wall-clock time.
+    optimizer: 'hill' (hill_climb) or 'anneal' (simulated_annealing, tuned with
+    anneal_options, e.g. {'iterations': 20000, 'schedule': 'linear'}).
+    """
+    deadline = time.time() + time_budget if time_budget is not None else None
     ciphertext_clean = ciphertext  # we apply key preserving non-letters
     initial_key = build_initial_key_from_freq(ciphertext)
     candidates = []  # list of dicts {score,key,plain}
+    scorer = make_scorer(ciphertext, fitness)  # n-gram counts are built once per attack
 
     # first run deterministic start
-    k, s, p = hill_climb(ciphertext_clean, initial_key, max_no_improve=200)
+    k, s, p = hill_climb(ciphertext_clean, initial_key, scorer=scorer)
     candidates.append({'score': s, 'key': k, 'plain': p})
+    done = target_score is not None and s >= target_score
 
-    # random restarts
-    for attempt in range(max(1,restarts)):
-        if attempt % 5 == 0:
-            # sometimes try fully random key
-            letters = list(ALPHABET)
-            random.shuffle(letters)
-            start = "".join(letters)
+    if not done and workers > 1:
+        for s, k, p in parallel_restarts(ciphertext_clean, initial_key, max(1, restarts),
+                                         random_seed, fitness, workers, target_score, deadline,
+                                         optimizer, anneal_options):
+            add_candidate(candidates, s, k, p)
+    elif not done:
+        if random_seed is not None:
+            random.seed(random_seed)
         else:
-            # randomize initial key by a few swaps
-            start = randomize_key(initial_key, swaps=1 + random.randrange(12))
-
-        k, s, p = hill_climb(ciphertext_clean, start, max_no_improve=150)
-        # add if plaintext unique
-        if not any(c['plain'] == p for c in candidates):
-            candidates.append({'score': s, 'key': k, 'plain': p})
-
-        # small local perturbations from this best
-        for extra in range(2):
-            start2 = randomize_key(k, swaps=1 + random.randrange(6))
-            k2, s2, p2 = hill_climb(ciphertext_clean, start2, max_no_improve=100)
-            if not any(c['plain'] == p2 for c in candidates):
-                candidates.append({'score': s2, 'key': k2, 'plain': p2})
+            random.seed()
+        # random restarts
+        for attempt in range(max(1,restarts)):
+            if deadline is not None and time.time() >= deadline:
+                break
+            found = run_restart(ciphertext_clean, scorer, initial_key, attempt,
+                                optimizer=optimizer, anneal_options=anneal_options)
+            for s, k, p in found:
+                add_candidate(candidates, s, k, p)
+            if target_score is not None and max(f[0] for f in found) >= target_score:
+                break
 
     # sort candidates descending by score
     candidates.sort(key=lambda x: -x['score'])
     return candidates[:top_n]
 
+# ---- Benchmark: hill-climb vs simulated annealing ----
+BENCHMARK_TEXT = (
+    "It was the best of times, it was the worst of times, it was the age of wisdom, "
+    "it was the age of foolishness, it was the epoch of belief, it was the epoch of "
+    "incredulity, it was the season of Light, it was the season of Darkness, it was the "
+    "spring of hope, it was the winter of despair, we had everything before us, we had "
+    "nothing before us, we were all going direct to Heaven, we were all going direct the "
+    "other way. In short, the period was so far like the present period, that some of its "
+    "noisiest authorities insisted on its being received, for good or for evil, in the "
+    "superlative degree of comparison only. There were a king with a large jaw and a queen "
+    "with a plain face, on the throne of England; there were a king with a large jaw and a "
+    "queen with a fair face, on the throne of France. In both countries it was clearer than "
+    "crystal to the lords of the State preserves of loaves and fishes, that things in general "
+    "were settled for ever. It was the year of Our Lord one thousand seven hundred and "
+    "seventy-five. Spiritual revelations were conceded to England at that favoured period, "
+    "as at this."
+)
+BENCHMARK_LENGTHS = (150, 300, 600, 1000)    # letters of BENCHMARK_TEXT per case
+
+def benchmark_cases(lengths=BENCHMARK_LENGTHS):
+    """Fixed (plaintext, ciphertext) cases: a prefix of BENCHMARK_TEXT under a fixed key."""
+    cases = []
+    for length in lengths:
+        letters = 0
+        for end, ch in enumerate(BENCHMARK_TEXT):
+            letters += ch.isalpha()
+            if letters == length:
+                break
+        plain = BENCHMARK_TEXT[:end + 1]
+        shuffled = list(ALPHABET)
+        random.Random(length).shuffle(shuffled)
+        enc = "".join(shuffled)
+        cipher = plain.translate(str.maketrans(ALPHABET + ALPHABET.lower(), enc + enc.lower()))
+        cases.append((plain, cipher))
+    return cases
+
+def letter_accuracy(plaintext, guess):
+    """Fraction of letters of plaintext that guess gets right."""
+    pairs = [(a, b) for a, b in zip(plaintext, guess) if a.isalpha()]
+    return sum(a == b for a, b in pairs) / max(1, len(pairs))
+
+def time_to_key(plaintext, ciphertext, optimizer="hill", fitness="heuristic",
+                time_limit=30.0, seed=0, anneal_options=None, min_accuracy=0.98):
+    """
+    Run restarts until one recovers at least min_accuracy of the letters of
+    plaintext (rare letters such as J/X are often indistinguishable in short
+    texts), or time_limit seconds pass.
+    Returns (seconds or None if not found, restarts used).
+    """
+    scorer = make_scorer(ciphertext, fitness)
+    rng = random.Random(seed)
+    initial_key = build_initial_key_from_freq(ciphertext)
+    start = time.time()
+    attempt = 0
+    while time.time() - start < time_limit:
+        found = run_restart(ciphertext, scorer, initial_key, attempt, rng,
+                            optimizer, anneal_options)
+        attempt += 1
+        if any(letter_accuracy(plaintext, p) >= min_accuracy for _, _, p in found):
+            return time.time() - start, attempt
+    return None, attempt
+
+def benchmark_optimizers(lengths=BENCHMARK_LENGTHS, fitness="heuristic", time_limit=30.0,
+                         seed=0, anneal_options=None):
+    """Print time-to-correct-key of hill_climb and simulated_annealing per ciphertext length."""
+    print(f"Time to correct key (fitness={fitness}, limit {time_limit:.0f}s per run)\n")
+    print(f"{'Letters':<9}{'Optimizer':<11}{'Seconds':>9}{'Restarts':>10}")
+    print("-" * 39)
+    for (plain, cipher), length in zip(benchmark_cases(lengths), lengths):
+        for optimizer in ("hill", "anneal"):
+            secs, used = time_to_key(plain, cipher, optimizer, fitness, time_limit, seed,
+                                     anneal_options)
+            shown = f"{secs:9.2f}" if secs is not None else f"{'>' + str(int(time_limit)):>9}"
+            print(f"{length:<9}{optimizer:<11}{shown}{used:>10}")
+
 # ---- CLI / Interaction ----
 def main():
     print("\nMonoalphabetic substitution solver (automatic)\n")
@@ -256,16 +684,35 @@ def main():
 
     top_n_raw = input("How many top candidates to show? (default 10) : ").strip() or "10"
     restarts_raw = input("How many random restarts? (default 200) : ").strip() or "200"
+    workers_raw = input("How many worker processes? (default 1) : ").strip() or "1"
     try:
         top_n = int(top_n_raw)
         restarts = int(restarts_raw)
+        workers = max(1, int(workers_raw))
     except:
-        print("Invalid numeric input; using defaults (10,200).")
+        print("Invalid numeric input; using defaults (10,200,1).")
         top_n = 10
         restarts = 200
+        workers = 1
+
+    fitness = "heuristic"
+    try:
+        import ngram_tables
+        if ngram_tables.tables_available(4):
+            use_quad = input("Use quadgram fitness from ngram_data? (Y/n) : ").strip().lower()
+            if use_quad in ("", "y", "yes"):
+                fitness = "quadgram"
+    except ImportError:
+        pass
+
+    optimizer = input("Optimizer: hill-climb or simulated annealing? (hill/anneal, default hill) : ").strip().lower() or "hill"
+    if optimizer not in ("hill", "anneal"):
+        print("Unknown optimizer; using hill.")
+        optimizer = "hill"
 
     print("\nRunning attack... (this may take a little while depending on restarts and ciphertext length)\n")
-    candidates = attack(ciphertext, top_n=top_n, restarts=restarts)
+    candidates = attack(ciphertext, top_n=top_n, restarts=restarts, fitness=fitness,
+                        workers=workers, optimizer=optimizer)
 
     print(f"\nTop {len(candidates)} candidates (ranked):\n")
     for i, cand in enumerate(candidates, start=1):
@@ -281,4 +728,7 @@ def main():
         print("\n")
 
 if __name__ == "__main__":
-    main()
+    if "--benchmark" in sys.argv[1:]:
+        benchmark_optimizers(fitness="quadgram" if "--quadgram" in sys.argv[1:] else "heuristic")
+    else:
+        main()
@@ -2,6 +2,10 @@
 # Given: IV = 10101010, Key = 0111111101, Plaintext = 0000000100100011
 # Expected Ciphertext = 1111010000001011
 
+# The cipher itself lives in sdes_core.py (integers and 256-entry tables per
+# key); these functions keep the bit-string interface of the lab.
+import sdes_core as sdes
+
 def permute(bits, pattern):
     return ''.join(bits[i - 1] for i in pattern)
 
@@ -10,101 +14,37 @@ def left_shift(bits, n):
 
 # --- Key Generation ---
 def generate_keys(key):
-    P10 = [3, 5, 2, 7, 4, 10, 1, 9, 8, 6]
-    P8  = [6, 3, 7, 4, 8, 5, 10, 9]
-    
-    key = permute(key, P10)
-    left, right = key[:5], key[5:]
-    
-    # 1-bit shift
-    left1, right1 = left_shift(left, 1), left_shift(right, 1)
-    K1 = permute(left1 + right1, P8)
-    
-    # 2-bit shift
-    left2, right2 = left_shift(left1, 2), left_shift(right1, 2)
-    K2 = permute(left2 + right2, P8)
-    
-    return K1, K2
+    K1, K2 = sdes.subkeys(int(key, 2))
+    return format(K1, '08b'), format(K2, '08b')
 
 # --- S-DES Functions ---
 def fk(bits, key):
-    EP = [4, 1, 2, 3, 2, 3, 4, 1]
-    S0 = [
-        [1, 0, 3, 2],
-        [3, 2, 1, 0],
-        [0, 2, 1, 3],
-        [3, 1, 3, 2]
-    ]
-    S1 = [
-        [0, 1, 2, 3],
-        [2, 0, 1, 3],
-        [3, 0, 1, 0],
-        [2, 1, 0, 3]
-    ]
-    P4 = [2, 4, 3, 1]
-    left, right = bits[:4], bits[4:]
-    temp = permute(right, EP)
-    xored = ''.join(str(int(a) ^ int(b)) for a, b in zip(temp, key))
-    left4, right4 = xored[:4], xored[4:]
-    row0 = int(left4[0] + left4[3], 2)
-    col0 = int(left4[1:3], 2)
-    row1 = int(right4[0] + right4[3], 2)
-    col1 = int(right4[1:3], 2)
-    s0_val = format(S0[row0][col0], '02b')
-    s1_val = format(S1[row1][col1], '02b')
-    s_output = permute(s0_val + s1_val, P4)
-    result = ''.join(str(int(a) ^ int(b)) for a, b in zip(left, s_output))
-    return result + right
+    return format(sdes.fk(int(bits, 2), int(key, 2)), '08b')
 
 def switch(bits):
     return bits[4:] + bits[:4]
 
 # --- Encrypt / Decrypt One Block ---
 def sdes_encrypt_block(block, K1, K2):
-    IP = [2, 6, 3, 1, 4, 8, 5, 7]
-    IP_inv = [4, 1, 3, 5, 7, 2, 8, 6]
-    bits = permute(block, IP)
-    temp = fk(bits, K1)
-    temp = switch(temp)
-    temp = fk(temp, K2)
-    return permute(temp, IP_inv)
+    return format(sdes.encrypt_block(int(block, 2), int(K1, 2), int(K2, 2)), '08b')
 
 def sdes_decrypt_block(block, K1, K2):
-    IP = [2, 6, 3, 1, 4, 8, 5, 7]
-    IP_inv = [4, 1, 3, 5, 7, 2, 8, 6]
-    bits = permute(block, IP)
-    temp = fk(bits, K2)
-    temp = switch(temp)
-    temp = fk(temp, K1)
-    return permute(temp, IP_inv)
+    return format(sdes.encrypt_block(int(block, 2), int(K2, 2), int(K1, 2)), '08b')
 
 # --- CBC MODE ---
+# Bit strings here; for bytes and files see sdes_core.cbc_encrypt_stream,
+# cbc_decrypt_stream and cbc_decrypt_file (decryption in parallel chunks)
 def xor_bits(a, b):
-    return ''.join(str(int(x) ^ int(y)) for x, y in zip(a, b))
+    n = min(len(a), len(b))
+    return format(int(a[:n], 2) ^ int(b[:n], 2), f'0{n}b') if n else ''
 
 def cbc_encrypt(plaintext, key, iv):
-    K1, K2 = generate_keys(key)
-    blocks = [plaintext[i:i+8] for i in range(0, len(plaintext), 8)]
-    prev = iv
-    ciphertext = ''
-    for block in blocks:
-        xored = xor_bits(block, prev)
-        c = sdes_encrypt_block(xored, K1, K2)
-        ciphertext += c
-        prev = c
-    return ciphertext
+    data = sdes.bits_to_bytes(plaintext)
+    return sdes.bytes_to_bits(sdes.cbc_encrypt(data, key, int(iv, 2)))
 
 def cbc_decrypt(ciphertext, key, iv):
-    K1, K2 = generate_keys(key)
-    blocks = [ciphertext[i:i+8] for i in range(0, len(ciphertext), 8)]
-    prev = iv
-    plaintext = ''
-    for block in blocks:
-        d = sdes_decrypt_block(block, K1, K2)
-        p = xor_bits(d, prev)
-        plaintext += p
-        prev = block
-    return plaintext
+    data = sdes.bits_to_bytes(ciphertext)
+    return sdes.bytes_to_bits(sdes.cbc_decrypt(data, key, int(iv, 2)))
 
 # --- TEST CASE ---
 if __name__ == "__main__":
@@ -123,3 +63,8 @@ if __name__ == "__main__":
 
     pt = cbc_decrypt(ct, KEY, IV)
     print("\nDecrypted plaintext:", pt)
+
+    # Key recovery: all 1024 keys tried against the plaintext/ciphertext pair
+    import sdes_attack
+    keys = sdes_attack.known_plaintext(PLAINTEXT, ct, "cbc", iv=int(IV, 2))
+    print("\nKeys consistent with this pair:", [format(k, '010b') for k in keys])
@@ -1,35 +1,179 @@
 from collections import Counter
+import heapq
 import itertools
+import math
+import sys
+import time
 ENGLISH_FREQ = 'ETAOINSHRDLCUMWFGYPBVKJXQZ'
+# English letter frequency (approximate percentage)
+ENGLISH_PERCENT = {
+    'E': 12.70, 'T': 9.06, 'A': 8.17, 'O': 7.51, 'I': 6.97, 'N': 6.75, 'S': 6.33,
+    'H': 6.09, 'R': 5.99, 'D': 4.25, 'L': 4.03, 'C': 2.78, 'U': 2.76, 'M': 2.41,
+    'W': 2.36, 'F': 2.23, 'G': 2.02, 'Y': 1.97, 'P': 1.93, 'B': 1.49, 'V': 0.98,
+    'K': 0.77, 'J': 0.15, 'X': 0.15, 'Q': 0.10, 'Z': 0.07
+}
+# Exact search is only practical for this many cipher letters; past it
+# ranked_mappings uses a beam of DEFAULT_BEAM partial mappings by default
+EXACT_TOP_K = 6
+DEFAULT_BEAM = 1000
 def get_freq_table(text):
     text = [c for c in text.upper() if c.isalpha()]
     freq = Counter(text)
     freq_lst = [x[0] for x in freq.most_common()]
     return freq_lst
-def freq_attack(ciphertext, top_n=10):
+def load_bigrams():
+    """Bigram log10-probability table from ngram_tables.py, or None if not trained."""
+    try:
+        import ngram_tables
+    except ImportError:
+        return None
+    if not ngram_tables.tables_available(2):
+        return None
+    return ngram_tables.load_table(2)
+def ranked_mappings(ciphertext, top_k=6, plain_letters=ENGLISH_FREQ, bigrams=None,
+                    beam_width=None):
+    """
+    Yield (log10 likelihood, mapping) for the top_k most frequent cipher letters,
+    most likely mapping first. The cost of a mapping is the unigram negative
+    log-likelihood of the mapped letters plus, if a bigram table is given, that
+    of every bigram whose two letters are both mapped. Mappings are built one
+    cipher letter at a time.
+    With beam_width=0 this is a best-first (A*) search whose estimate for the
+    unmapped letters never exceeds their real cost, so mappings come out exactly
+    in order without enumerating all permutations. Past EXACT_TOP_K letters with
+    bigrams that blows up (seconds at 8 letters, unfinished at 10); a
+    beam_width keeps only that many partial mappings per letter instead and
+    yields the survivors in order (approximate, but the cost grows linearly with
+    top_k). beam_width=None picks exact search up to EXACT_TOP_K letters and a
+    DEFAULT_BEAM beam above.
+    """
+    if beam_width is None:
+        beam_width = DEFAULT_BEAM if top_k > EXACT_TOP_K else 0
+    text = [c for c in ciphertext.upper() if c.isalpha()]
+    counts = Counter(text)
+    cipher_top = [c for c, _ in counts.most_common(top_k)]
+    depth_max = len(cipher_top)
+    if depth_max == 0:
+        return
+    unigram_cost = [{p: -counts[c] * math.log10(ENGLISH_PERCENT[p] / 100) for p in plain_letters}
+                    for c in cipher_top]
+    pair_counts = Counter(zip(text, text[1:]))
+    # pairs[d][j] = (count of cipher_top[j] cipher_top[d], count of cipher_top[d] cipher_top[j])
+    pairs = [[(pair_counts[(e, c)], pair_counts[(c, e)]) for e in cipher_top[:d]]
+             for d, c in enumerate(cipher_top)]
+    values = bigrams.values if bigrams is not None else None
+
+    def step_cost(d, p, assigned):
+        """Cost added by mapping cipher_top[d] to p after the letters in assigned."""
+        cost = unigram_cost[d][p]
+        if values is not None:
+            pi = ord(p) - 65
+            cost -= pair_counts[(cipher_top[d], cipher_top[d])] * values[pi * 26 + pi]
+            for (into, out_of), q in zip(pairs[d], assigned):
+                qi = ord(q) - 65
+                cost -= into * values[qi * 26 + pi] + out_of * values[pi * 26 + qi]
+        return cost
+
+    # bound[d]: lowest cost cipher_top[d] can add when it is mapped. A bigram is
+    # charged to its later-mapped letter, so the other letter is bounded by the
+    # best bigram ending (or starting) with the candidate plain letter.
+    bound = []
+    for d, c in enumerate(cipher_top):
+        costs = []
+        for p in plain_letters:
+            cost = unigram_cost[d][p]
+            if values is not None:
+                pi = ord(p) - 65
+                best_into = max(values[q * 26 + pi] for q in range(26))
+                best_out = max(values[pi * 26 + q] for q in range(26))
+                cost -= pair_counts[(c, c)] * values[pi * 26 + pi]
+                for into, out_of in pairs[d]:
+                    cost -= into * best_into + out_of * best_out
+            costs.append(cost)
+        bound.append(min(costs))
+    # rest[d]: lower bound for mapping cipher_top[d:]
+    rest = [0.0] * (depth_max + 1)
+    for d in range(depth_max - 1, -1, -1):
+        rest[d] = rest[d + 1] + bound[d]
+
+    if beam_width:
+        beam = [(0.0, ())]
+        for d in range(depth_max):
+            grown = [(g + step_cost(d, p, assigned), assigned + (p,))
+                     for g, assigned in beam for p in plain_letters if p not in assigned]
+            beam = heapq.nsmallest(beam_width, grown)
+        for g, assigned in beam:
+            yield -g, dict(zip(cipher_top, assigned))
+        return
+
+    tie = itertools.count()
+    heap = [(rest[0], 0.0, next(tie), ())]
+    while heap:
+        _, g, _, assigned = heapq.heappop(heap)
+        d = len(assigned)
+        if d == depth_max:
+            yield -g, dict(zip(cipher_top, assigned))
+            continue
+        for p in plain_letters:
+            if p not in assigned:
+                g2 = g + step_cost(d, p, assigned)
+                heapq.heappush(heap, (g2 + rest[d + 1], g2, next(tie), assigned + (p,)))
+def freq_attack(ciphertext, top_n=10, top_k=6, beam_width=None):
     ciphertext = ciphertext.upper()
-    cipher_freq = get_freq_table(ciphertext)
-    length = len(cipher_freq)
-    num_permutations = min(top_n, 720)  # 6! = 720
     results = []
-    K = min(6, length)
-    cipher_top = cipher_freq[:K]
-    plain_top = ENGLISH_FREQ[:K]
-    for perm in itertools.islice(itertools.permutations(plain_top, K), num_permutations):
-        mapping = dict(zip(cipher_top, perm))
-        result = ''
-        for char in ciphertext:
-            if char in mapping:
-                result += mapping[char]
-            else:
-                result += char
-        results.append(result)
+    if beam_width is None and top_k > EXACT_TOP_K:
+        beam_width = max(DEFAULT_BEAM, top_n)
+    mappings = ranked_mappings(ciphertext, top_k, bigrams=load_bigrams(), beam_width=beam_width)
+    for score, mapping in itertools.islice(mappings, top_n):
+        table = str.maketrans(mapping)
+        results.append((score, ciphertext.translate(table)))
     print(f"Top {min(top_n, len(results))} probable plaintexts:")
-    for i, candidate in enumerate(results[:top_n]):
-        print(f"{i+1}: {candidate}")
+    for i, (score, candidate) in enumerate(results[:top_n]):
+        print(f"{i+1} ({score:.1f}): {candidate}")
+SELF_TEST_TEXT = (
+    "It was the best of times, it was the worst of times, it was the age of wisdom, "
+    "it was the age of foolishness, it was the epoch of belief, it was the epoch of "
+    "incredulity, it was the season of Light, it was the season of Darkness, it was the "
+    "spring of hope, it was the winter of despair, we had everything before us, we had "
+    "nothing before us, we were all going direct to Heaven, we were all going direct the "
+    "other way."
+)
+def self_test():
+    """Ranked mappings with a bigram table: exact at 6 letters, a quick beam at 8 and 10."""
+    import os
+    import random
+    import tempfile
+    import ngram_tables
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "corpus.txt")
+        with open(corpus, 'w') as f:
+            f.write(SELF_TEST_TEXT)
+        table = ngram_tables.NgramTable(ngram_tables.train([corpus], tmp, orders=(2,))[2], 2)
+        shuffled = list(ENGLISH_FREQ)
+        random.Random(1).shuffle(shuffled)
+        ciphertext = SELF_TEST_TEXT.upper().translate(str.maketrans(ENGLISH_FREQ, "".join(shuffled)))
+        ok = True
+        for top_k in (6, 8, 10):
+            start = time.perf_counter()
+            found = list(itertools.islice(ranked_mappings(ciphertext, top_k, bigrams=table), 10))
+            seconds = time.perf_counter() - start
+            scores = [score for score, _ in found]
+            passed = (len(found) == 10 and scores == sorted(scores, reverse=True)
+                      and all(len(mapping) == top_k for _, mapping in found) and seconds < 5)
+            if top_k <= EXACT_TOP_K:
+                exact = itertools.islice(ranked_mappings(ciphertext, top_k, bigrams=table,
+                                                         beam_width=0), 10)
+                passed &= found == list(exact)
+            ok &= passed
+            print(f"top_k={top_k}: {seconds:.2f}s {'ok' if passed else 'FAILED'}")
+    return ok
 if __name__ == "__main__":
+    if sys.argv[1:] == ["--self-test"]:
+        sys.exit(0 if self_test() else 1)
     print("Enter ciphertext (letters, spaces, punctuation allowed):")
     ciphertext = input()
     print("How many top plaintexts do you want to see (e.g. 10)?")
     top_n = int(input())
-    freq_attack(ciphertext, top_n)
+    print("How many of the most frequent cipher letters should be mapped (default 6)?")
+    top_k = int(input().strip() or "6")
+    freq_attack(ciphertext, top_n, top_k)
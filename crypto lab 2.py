@@ -1,33 +1,43 @@
 import string
 import random
+from functools import lru_cache
 def generate_key():
     letters = list(string.ascii_lowercase)
     shuffled = letters.copy()
     random.shuffle(shuffled)
     return dict(zip(letters, shuffled))
+# Compiled key: translate tables for both directions, built once per key
+class CompiledKey:
+    def __init__(self, cipher_alphabet):
+        self.enc_table = str.maketrans(string.ascii_lowercase, cipher_alphabet)
+        self.dec_table = str.maketrans(cipher_alphabet, string.ascii_lowercase)
+    def encrypt(self, plaintext):
+        return plaintext.lower().translate(self.enc_table)
+    def decrypt(self, ciphertext):
+        return ciphertext.translate(self.dec_table)
+# dict keys are not hashable, so the cache is keyed on the cipher alphabet
+@lru_cache(maxsize=256)
+def _compile(cipher_alphabet):
+    return CompiledKey(cipher_alphabet)
+def compile_key(key):
+    return _compile("".join(key[c] for c in string.ascii_lowercase))
 def encrypt(plaintext, key):
-    ciphertext = ""
-    for char in plaintext.lower():
-        if char in key:
-            ciphertext += key[char]
-        else:
-            ciphertext += char  
-    return ciphertext
+    return compile_key(key).encrypt(plaintext)
 def decrypt(ciphertext, key):
-    reversed_key = {v: k for k, v in key.items()}
-    plaintext = ""
-    for char in ciphertext:
-        if char in reversed_key:
-            plaintext += reversed_key[char]
-        else:
-            plaintext += char
-    return plaintext
-plaintext = input("Enter the plaintext: ")
-key = generate_key()
-print("\nGenerated Cipher Key:")
-for p, c in key.items():
-    print(f"{p} → {c}")
-ciphertext = encrypt(plaintext, key)
-print("\nEncrypted text:", ciphertext)
-decrypted = decrypt(ciphertext, key)
-print("Decrypted text:", decrypted)
+    return compile_key(key).decrypt(ciphertext)
+def encrypt_many(plaintexts, key):
+    compiled = compile_key(key)
+    return [compiled.encrypt(p) for p in plaintexts]
+def decrypt_many(ciphertexts, key):
+    compiled = compile_key(key)
+    return [compiled.decrypt(c) for c in ciphertexts]
+if __name__ == "__main__":
+    plaintext = input("Enter the plaintext: ")
+    key = generate_key()
+    print("\nGenerated Cipher Key:")
+    for p, c in key.items():
+        print(f"{p} → {c}")
+    ciphertext = encrypt(plaintext, key)
+    print("\nEncrypted text:", ciphertext)
+    decrypted = decrypt(ciphertext, key)
+    print("Decrypted text:", decrypted)
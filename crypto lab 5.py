@@ -14,12 +14,17 @@ def affine_encrypt(text, a, b):
             result += char
     return result
 
-# Function to find modular inverse of a mod 26
+# Multiplicative inverses mod 26, computed once
+MOD26_INVERSES = {a: x for a in range(26) for x in range(26) if (a * x) % 26 == 1}
+
+# Function to find modular inverse of a mod m (table lookup for m = 26)
 def mod_inverse(a, m):
-    for x in range(1, m):
-        if (a * x) % m == 1:
-            return x
-    return None
+    if m == 26:
+        return MOD26_INVERSES.get(a % 26)
+    try:
+        return pow(a, -1, m)
+    except ValueError:
+        return None
 
 def affine_decrypt(cipher, a, b):
     result = ""
@@ -1,32 +1,131 @@
 from collections import Counter
+from itertools import permutations
+import string
+# Multiplicative inverses mod 26, computed once (a -> a^-1 for the 12 units)
+MOD26_INVERSES = {a: x for a in range(26) for x in range(26) if (a * x) % 26 == 1}
+VALID_A = sorted(MOD26_INVERSES)
+ALL_KEYS = [(a, b) for a in VALID_A for b in range(26)]   # the 312 affine keys
+ENGLISH_ORDER = 'ETAOINSHRDLCUMWFGYPBVKJXQZ'
+ENGLISH_FREQ = {
+    'A': 8.17, 'B': 1.49, 'C': 2.78, 'D': 4.25, 'E': 12.70, 'F': 2.23, 'G': 2.02,
+    'H': 6.09, 'I': 6.97, 'J': 0.15, 'K': 0.77, 'L': 4.03, 'M': 2.41, 'N': 6.75,
+    'O': 7.51, 'P': 1.93, 'Q': 0.10, 'R': 5.99, 'S': 6.33, 'T': 9.06, 'U': 2.76,
+    'V': 0.98, 'W': 2.36, 'X': 0.15, 'Y': 1.97, 'Z': 0.07
+}
+EXPECTED = [ENGLISH_FREQ[c] for c in string.ascii_uppercase]
 def modinv(a, m):
-    for i in range(1, m):
-        if (a * i) % m == 1:
-            return i
-    return None
+    if m == 26:
+        return MOD26_INVERSES.get(a % 26)
+    try:
+        return pow(a, -1, m)
+    except ValueError:
+        return None
 def affine_decrypt(ciphertext, a, b, m=26):
     a_inv = modinv(a, m)
     if a_inv is None:
         return None
-    plaintext = ""
-    for char in ciphertext:
-        if char.isalpha():
-            y = ord(char.upper()) - ord('A')
-            x = (a_inv * (y - b)) % m
-            plaintext += chr(x + ord('A'))
-        else:
-            plaintext += char
-    return plaintext
+    if m != 26:
+        plaintext = []
+        for char in ciphertext:
+            if char.isalpha():
+                y = ord(char.upper()) - ord('A')
+                plaintext.append(chr((a_inv * (y - b)) % m + ord('A')))
+            else:
+                plaintext.append(char)
+        return "".join(plaintext)
+    plain = "".join(chr((a_inv * (y - b)) % 26 + ord('A')) for y in range(26))
+    table = str.maketrans(string.ascii_uppercase + string.ascii_lowercase, plain + plain)
+    return ciphertext.translate(table)
 def char_to_num(c): return ord(c.upper()) - ord('A')
 def num_to_char(n): return chr((n % 26) + ord('A'))
-cipher_freq1, cipher_freq2 = char_to_num('B'), char_to_num('U')
-plain_freq1, plain_freq2 = char_to_num('E'), char_to_num('T')
-denominator = (plain_freq1 - plain_freq2) % 26
-numerator = (cipher_freq1 - cipher_freq2) % 26
-inv_denominator = modinv(denominator, 26)
-a = (numerator * inv_denominator) % 26
-b = (cipher_freq1 - a * plain_freq1) % 26
-print(f"Possible keys: a={a}, b={b}")
-ciphertext = "YOURCIPHERTEXTHERE"
-decrypted = affine_decrypt(ciphertext, a, b)
-print("Decrypted Text:", decrypted)
+def letter_histogram(text):
+    counts = [0] * 26
+    for c in text.upper():
+        if 'A' <= c <= 'Z':
+            counts[ord(c) - ord('A')] += 1
+    return counts
+# Key from two guesses: cipher letter c1 is plain p1, c2 is plain p2.
+# Returns None when the pairing gives no valid key.
+def key_from_pairing(c1, p1, c2, p2):
+    denominator = (char_to_num(p1) - char_to_num(p2)) % 26
+    numerator = (char_to_num(c1) - char_to_num(c2)) % 26
+    inv_denominator = MOD26_INVERSES.get(denominator)
+    if inv_denominator is None:
+        return None
+    a = (numerator * inv_denominator) % 26
+    if a not in MOD26_INVERSES:
+        return None
+    b = (char_to_num(c1) - a * char_to_num(p1)) % 26
+    return a, b
+# Keys from pairing the top cipher letters with the top English letters
+# (generalizes the single B->E, U->T guess)
+def frequency_pair_keys(ciphertext, top_cipher=4, top_plain=6):
+    counts = Counter(c for c in ciphertext.upper() if 'A' <= c <= 'Z')
+    cipher_top = [c for c, _ in counts.most_common(top_cipher)]
+    keys = []
+    for c1, c2 in permutations(cipher_top, 2):
+        for p1, p2 in permutations(ENGLISH_ORDER[:top_plain], 2):
+            key = key_from_pairing(c1, p1, c2, p2)
+            if key is not None and key not in keys:
+                keys.append(key)
+    return keys
+# Chi-square of a key, straight from the ciphertext histogram: plain letter x
+# comes from cipher letter (a*x + b) % 26, so nothing is decrypted.
+def key_score(counts, a, b):
+    total = sum(counts)
+    if total == 0:
+        return float('inf')
+    chi_sq = 0.0
+    for x in range(26):
+        observed = counts[(a * x + b) % 26] * 100 / total
+        chi_sq += (observed - EXPECTED[x]) ** 2 / EXPECTED[x]
+    return chi_sq
+# Rank keys (default: all 312) by chi-square, best first: [(score, a, b), ...]
+def rank_keys(ciphertext, keys=None):
+    counts = letter_histogram(ciphertext)
+    ranked = [(key_score(counts, a, b), a, b) for a, b in (ALL_KEYS if keys is None else keys)]
+    ranked.sort()
+    return ranked
+# Letter counts of many messages at once: (messages x 26) NumPy array,
+# from one bincount over message_id * 26 + letter
+def batch_histograms(ciphertexts):
+    import numpy as np
+    if not ciphertexts:
+        return np.zeros((0, 26), dtype=np.int64)
+    encoded = [t.upper().encode('ascii', 'ignore') for t in ciphertexts]
+    lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    owner = np.repeat(np.arange(len(encoded)), lengths)
+    letters = (data >= ord('A')) & (data <= ord('Z'))
+    cells = owner[letters] * 26 + (data[letters] - ord('A'))
+    return np.bincount(cells, minlength=len(encoded) * 26).reshape(len(encoded), 26)
+# All 312 keys for many ciphertexts at once with NumPy.
+# Returns (scores, keys): scores is (messages x 312) chi-square, keys the
+# matching (a, b) list; scores.argmin(axis=1) picks each message's best key.
+# sum_x (O[(a*x + b) % 26] - E[x])^2 / E[x] = sum_c O[c]^2 * W[c, key] - 200
+# + sum E, where W[(a*x + b) % 26, key] = 1 / E[x], so every key is one
+# (messages x 26) @ (26 x 312) product and memory stays O(messages x 312).
+def batch_rank_keys(ciphertexts):
+    import numpy as np
+    counts = batch_histograms(ciphertexts).astype(np.float64)
+    totals = counts.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        observed = counts * 100 / totals
+    expected = np.array(EXPECTED)
+    x = np.arange(26)
+    weights = np.zeros((26, len(ALL_KEYS)))
+    for k, (a, b) in enumerate(ALL_KEYS):
+        weights[(a * x + b) % 26, k] = 1.0 / expected
+    scores = (observed ** 2) @ weights - 200 + expected.sum()
+    scores[totals[:, 0] == 0] = np.inf
+    return scores, ALL_KEYS
+if __name__ == "__main__":
+    cipher_freq1, cipher_freq2 = 'B', 'U'
+    a, b = key_from_pairing(cipher_freq1, 'E', cipher_freq2, 'T')
+    print(f"Possible keys: a={a}, b={b}")
+    ciphertext = "YOURCIPHERTEXTHERE"
+    decrypted = affine_decrypt(ciphertext, a, b)
+    print("Decrypted Text:", decrypted)
+    print("\nTop keys (all 312 tried, chi-square, lower is better):")
+    for score, a, b in rank_keys(ciphertext)[:5]:
+        print(f"a={a:<2} b={b:<2} score={score:9.2f}  {affine_decrypt(ciphertext, a, b)}")
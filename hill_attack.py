@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Ciphertext-only Hill cipher attack: search the decryption matrix row by row.
+
+Usage:
+  - python3 hill_attack.py "CIPHERTEXT" [n]
+  - import hill_attack
+    result = hill_attack.attack(ciphertext, n=3)
+    score, key, plaintext = result.candidates[0]
+
+Notes:
+  - With c = K p (hill_engine), plaintext letter i of every block is
+    D[i] . c mod 26 for the decryption matrix D = K^-1, so each row of D
+    decides every n-th plaintext letter on its own. All 26^n possible rows
+    (17,576 for 3x3) are applied to the whole ciphertext in one matrix
+    product per chunk and scored with the unigram chi-square of
+    crypt lab 15.py's score_text; nothing is decrypted row by row in Python.
+  - A row's score does not depend on which position it fills, so the best
+    ROW_CANDIDATES rows are combined in every order into full matrices.
+    Those that are invertible mod 26 decrypt the whole message in batches and
+    are ranked by quadgram fitness (ngram_tables.py; train the tables first).
+    Unigram counts cannot tell the orders apart, which is why the rows are
+    only pre-selected by chi-square.
+  - The chi-square needs enough letters per row: roughly 60+ letters of
+    ciphertext for 2x2 and 150+ for 3x3. Shorter texts may need a larger
+    row_candidates.
+"""
+
+import itertools
+import string
+import sys
+import time
+
+import numpy as np
+
+import hill_engine as hill
+import ngram_tables
+
+ROW_CANDIDATES = 24      # best-scoring rows combined into full keys
+ROW_CHUNK = 8192         # candidate rows scored per matrix product
+COMBINE_BATCH = 20000    # full keys decrypted and scored per batch
+TOP_K = 10
+
+# English letter frequency (approximate percentage), as in crypt lab 15.py
+ENGLISH_FREQ = {
+    'E': 12.0, 'T': 9.1, 'A': 8.2, 'O': 7.5, 'I': 7.0, 'N': 6.7, 'S': 6.3,
+    'H': 6.1, 'R': 6.0, 'D': 4.3, 'L': 4.0, 'C': 2.8, 'U': 2.8, 'M': 2.4,
+    'W': 2.4, 'F': 2.2, 'G': 2.0, 'Y': 2.0, 'P': 1.9, 'B': 1.5, 'V': 1.0,
+    'K': 0.8, 'X': 0.2, 'J': 0.15, 'Q': 0.1, 'Z': 0.07
+}
+EXPECTED = np.array([ENGLISH_FREQ[c] for c in string.ascii_uppercase])
+
+
+class AttackResult:
+    __slots__ = ("candidates", "rows", "keys", "seconds")
+
+    def __init__(self, candidates, rows, keys, seconds):
+        self.candidates = candidates      # [(score, key, plaintext), ...], best first
+        self.rows = rows                  # candidate rows scored (26^n)
+        self.keys = keys                  # full keys built from the best rows
+        self.seconds = seconds
+
+
+def chi_square(letters):
+    """
+    Chi-square against English (score_text's formula) of each row of a
+    (candidates x letters) array of 0..25; lower is better.
+    """
+    count, length = letters.shape
+    counts = np.bincount((letters + 26 * np.arange(count)[:, None]).ravel(),
+                         minlength=26 * count).reshape(count, 26)
+    observed = counts * 100 / length
+    return ((observed - EXPECTED) ** 2 / EXPECTED).sum(axis=1)
+
+
+def all_rows(n):
+    """Every possible key row: a (26^n x n) array, row r holding the base-26 digits of r."""
+    return (np.arange(26 ** n)[:, None] // 26 ** np.arange(n - 1, -1, -1)) % 26
+
+
+def score_rows(blocks, rows, chunk=ROW_CHUNK):
+    """Chi-square of the letters each row produces from the cipher blocks."""
+    scores = np.empty(len(rows))
+    for start in range(0, len(rows), chunk):
+        part = rows[start:start + chunk]
+        scores[start:start + chunk] = chi_square((part @ blocks.T) % 26)
+    return scores
+
+
+def best_rows(blocks, n, keep=ROW_CANDIDATES):
+    """The keep lowest chi-square decryption rows, best first, with their scores."""
+    rows = all_rows(n)
+    scores = score_rows(blocks, rows)
+    best = np.argpartition(scores, keep)[:keep] if keep < len(rows) else np.arange(len(rows))
+    best = best[np.argsort(scores[best], kind='stable')]
+    return rows[best], scores[best]
+
+
+def make_fitness(table):
+    """Return fitness(plain): quadgram score of each row of a (keys x letters) array."""
+    if table.n != 4:
+        raise ValueError("hill_attack expects the order-4 table")
+    values = table.as_array()
+
+    def fitness(plain):
+        index = plain[:, :-3] * 17576 + plain[:, 1:-2] * 676 + plain[:, 2:-1] * 26 + plain[:, 3:]
+        return values[index].sum(axis=1, dtype=np.float64)
+    return fitness
+
+
+def combine_rows(blocks, rows, fitness, top_k=TOP_K, batch=COMBINE_BATCH):
+    """
+    Build decryption matrices from every ordered choice of n distinct rows,
+    keep the invertible ones and score their decryptions.
+    Returns ([(score, decryption matrix, plain letters), ...] best first, keys tried).
+    """
+    n = blocks.shape[1]
+    orders = itertools.permutations(range(len(rows)), n)
+    found, tried = [], 0
+    while True:
+        chosen = np.array(list(itertools.islice(orders, batch)))
+        if len(chosen) == 0:
+            break
+        matrices = rows[chosen]                        # (keys, n, n)
+        _, ok = hill.inverse_mod_batch(matrices)
+        matrices = matrices[ok]
+        tried += len(matrices)
+        if len(matrices) == 0:
+            continue
+        plain = (blocks @ matrices.transpose(0, 2, 1)) % 26
+        plain = plain.reshape(len(matrices), -1)
+        scores = fitness(plain)
+        best = np.argsort(-scores, kind='stable')[:top_k]
+        found.extend((float(scores[i]), matrices[i], plain[i]) for i in best)
+        found.sort(key=lambda item: -item[0])
+        del found[top_k:]
+    return found, tried
+
+
+def attack(ciphertext, n=2, row_candidates=ROW_CANDIDATES, top_k=TOP_K, table=None):
+    """
+    Recover an n x n Hill key from ciphertext alone (table: order-4
+    NgramTable, by default the trained one).
+    Returns an AttackResult whose candidates hold encryption keys (lists of
+    lists) with their plaintexts.
+    """
+    blocks = hill.text_to_blocks(ciphertext, n).astype(np.int64)
+    if len(blocks) < 2 * n:
+        raise ValueError("ciphertext too short to score")
+    table = table or ngram_tables.load_table(4)
+    start = time.monotonic()
+    rows, _ = best_rows(blocks, n, min(row_candidates, 26 ** n))
+    found, tried = combine_rows(blocks, rows, make_fitness(table), top_k)
+    candidates = []
+    for score, matrix, plain in found:
+        key = hill.inverse_mod(matrix.tolist())
+        candidates.append((score, key, hill.blocks_to_text(plain)))
+    return AttackResult(candidates, 26 ** n, tried, time.monotonic() - start)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Usage: python3 hill_attack.py "CIPHERTEXT" [n]')
+        return
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    result = attack(sys.argv[1], n)
+    print(f"{result.rows:,} rows scored, {result.keys:,} invertible keys tried "
+          f"in {result.seconds:.2f}s")
+    for score, key, plaintext in result.candidates:
+        print(f"{score:10.1f}  {str(key):<32} {plaintext[:50]}")
+
+
+if __name__ == "__main__":
+    main()
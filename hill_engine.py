@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Hill cipher engine for any block size n (A=0 .. Z=25, arithmetic mod 26).
+
+Usage:
+  - import hill_engine as hill
+    key = hill.HillKey([[9, 4], [5, 7]])       # raises HillKeyError if not invertible
+    c = hill.encrypt("meet me at the usual place", key)
+    hill.decrypt(c, key)
+    for line in hill.trace("meet me", key): print(line)
+  - python3 hill_engine.py          (throughput benchmark for n = 2 .. 8)
+
+Notes:
+  - A block p (column vector) encrypts to c = K p mod 26. A message is held
+    as a (blocks x n) array P, so the whole message is C = P K^T mod 26: one
+    integer matrix product, no per-block Python loop.
+  - Keys are checked and inverted exactly, nothing goes through floats: the
+    determinant comes from fraction-free (Bareiss) elimination on Python
+    ints, and inverses from integer Gauss-Jordan mod 2 and mod 13 joined by
+    the CRT (inverse_mod_batch inverts a whole stack of matrices at once).
+  - trace() rebuilds the per-block arithmetic for display only; encrypt and
+    decrypt never format anything.
+"""
+
+import math
+import random
+import string
+import sys
+import time
+
+import numpy as np
+
+ALPHABET = string.ascii_uppercase
+MOD = 26
+PAD = "X"
+BENCHMARK_SIZES = range(2, 9)
+
+# Upper-case letters only; everything else removed
+_CLEAN = str.maketrans(string.ascii_lowercase, ALPHABET,
+                       "".join(chr(c) for c in range(128) if chr(c) not in string.ascii_letters))
+
+
+class HillKeyError(ValueError):
+    """Key matrix is not square or not invertible mod 26."""
+
+
+def modinv(a, m=MOD):
+    """Inverse of a mod m, or None if gcd(a, m) != 1."""
+    a %= m
+    if math.gcd(a, m) != 1:
+        return None
+    return pow(a, -1, m)
+
+
+# ---- Exact integer matrix arithmetic ----
+def determinant(matrix):
+    """Exact integer determinant (Bareiss fraction-free elimination)."""
+    a = [[int(x) for x in row] for row in matrix]
+    n = len(a)
+    sign, previous = 1, 1
+    for k in range(n - 1):
+        if a[k][k] == 0:
+            swap = next((i for i in range(k + 1, n) if a[i][k] != 0), None)
+            if swap is None:
+                return 0
+            a[k], a[swap] = a[swap], a[k]
+            sign = -sign
+        for i in range(k + 1, n):
+            for j in range(k + 1, n):
+                a[i][j] = (a[i][j] * a[k][k] - a[i][k] * a[k][j]) // previous
+        previous = a[k][k]
+    return sign * a[n - 1][n - 1] if n else 1
+
+
+def adjugate(matrix):
+    """Exact integer adjugate (transposed cofactor matrix)."""
+    a = [[int(x) for x in row] for row in matrix]
+    n = len(a)
+    if n == 1:
+        return [[1]]
+    adj = [[0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            minor = [row[:j] + row[j + 1:] for r, row in enumerate(a) if r != i]
+            adj[j][i] = (-1) ** (i + j) * determinant(minor)
+    return adj
+
+
+# Inverses mod the primes of 26 (0 has none; the entry is never used)
+_PRIME_INVERSES = {p: np.array([0] + [pow(x, -1, p) for x in range(1, p)], dtype=np.int64)
+                   for p in (2, 13)}
+
+
+def inverse_mod_prime(matrices, p):
+    """
+    Gauss-Jordan on [A | I] over the field Z/p (p = 2 or 13) for a (B x n x n)
+    stack at once. Returns (inverses, ok); ok[b] is False where A[b] is
+    singular mod p.
+    """
+    matrices = np.asarray(matrices, dtype=np.int64)
+    if matrices.ndim == 2:
+        matrices = matrices[None]
+    count, n, _ = matrices.shape
+    inv = _PRIME_INVERSES[p]
+    work = np.concatenate([matrices % p, np.broadcast_to(np.eye(n, dtype=np.int64),
+                                                         (count, n, n))], axis=2)
+    ok = np.ones(count, dtype=bool)
+    rows = np.arange(count)
+    for k in range(n):
+        # first row at or below k with a non-zero entry in column k
+        nonzero = work[:, k:, k] != 0
+        ok &= nonzero.any(axis=1)
+        pivot = k + nonzero.argmax(axis=1)
+        top, chosen = work[rows, k].copy(), work[rows, pivot].copy()
+        work[rows, pivot], work[rows, k] = top, chosen
+        work[:, k] = (work[:, k] * inv[work[:, k, k]][:, None]) % p
+        factors = work[:, :, k].copy()
+        factors[:, k] = 0
+        work -= factors[:, :, None] * work[:, k][:, None, :]
+        work %= p
+    return work[:, :, n:], ok
+
+
+def inverse_mod_batch(matrices):
+    """
+    Exact inverses mod 26 of a stack of n x n integer matrices, all at once.
+    26 is not prime, so each matrix is inverted by Gauss-Jordan mod 2 and mod
+    13 and the two results are joined with the CRT (x = 13a + 14b mod 26).
+    Returns (inverses, ok): ok[b] is False where matrix b has no inverse mod
+    26, and inverses[b] is then meaningless.
+    """
+    matrices = np.asarray(matrices, dtype=np.int64)
+    if matrices.ndim == 2:
+        matrices = matrices[None]
+    inv2, ok2 = inverse_mod_prime(matrices, 2)
+    inv13, ok13 = inverse_mod_prime(matrices, 13)
+    return (13 * inv2 + 14 * inv13) % MOD, ok2 & ok13
+
+
+def inverse_mod(matrix, m=MOD):
+    """Exact inverse mod m as a list of lists, or None if the matrix is singular mod m."""
+    if m == MOD:
+        inverses, ok = inverse_mod_batch([matrix])
+        return inverses[0].tolist() if ok[0] else None
+    det_inv = modinv(determinant(matrix), m)
+    if det_inv is None:
+        return None
+    return [[(det_inv * x) % m for x in row] for row in adjugate(matrix)]
+
+
+class HillKey:
+    """
+    A validated n x n key with its inverse.
+    matrix / inverse: int32 arrays with entries 0..25; det: determinant mod 26.
+    """
+
+    __slots__ = ("n", "matrix", "inverse", "det")
+
+    def __init__(self, matrix):
+        rows = [list(row) for row in matrix]
+        n = len(rows)
+        if n == 0 or any(len(row) != n for row in rows):
+            raise HillKeyError("key must be a non-empty square matrix")
+        rows = [[int(x) % MOD for x in row] for row in rows]
+        det = determinant(rows) % MOD
+        if math.gcd(det, MOD) != 1:
+            factor = " and ".join(str(p) for p in (2, 13) if det % p == 0)
+            raise HillKeyError(f"key is not invertible mod 26 (det = {det}, divisible by {factor})")
+        self.n = n
+        self.det = det
+        self.matrix = np.array(rows, dtype=np.int32)
+        self.inverse = np.array(inverse_mod(rows), dtype=np.int32)
+
+    def __repr__(self):
+        return f"HillKey({self.matrix.tolist()})"
+
+
+def random_key(n, rng=random):
+    """A random invertible n x n key."""
+    while True:
+        rows = [[rng.randrange(MOD) for _ in range(n)] for _ in range(n)]
+        if math.gcd(determinant(rows) % MOD, MOD) == 1:
+            return HillKey(rows)
+
+
+# ---- Text <-> blocks ----
+def clean_text(text):
+    """Upper-case letters only."""
+    text = text.translate(_CLEAN)
+    if not text.isascii():
+        text = "".join(ch for ch in text if ch in ALPHABET)
+    return text
+
+
+def text_to_blocks(text, n, pad=PAD):
+    """Letters of text as a (blocks x n) array of 0..25, padded to a whole block."""
+    letters = clean_text(text)
+    if len(letters) % n:
+        letters += pad * (n - len(letters) % n)
+    values = np.frombuffer(letters.encode("ascii"), dtype=np.uint8).astype(np.int32) - 65
+    return values.reshape(-1, n)
+
+
+def blocks_to_text(blocks):
+    return (np.asarray(blocks, dtype=np.uint8).ravel() + 65).tobytes().decode("ascii")
+
+
+def _as_key(key):
+    return key if isinstance(key, HillKey) else HillKey(key)
+
+
+# ---- Encryption ----
+def apply_matrix(blocks, matrix):
+    """Transform every block (row of blocks) by matrix: one product, then mod 26."""
+    return (blocks @ matrix.T) % MOD
+
+
+def encrypt(plaintext, key, pad=PAD):
+    key = _as_key(key)
+    return blocks_to_text(apply_matrix(text_to_blocks(plaintext, key.n, pad), key.matrix))
+
+
+def decrypt(ciphertext, key):
+    key = _as_key(key)
+    return blocks_to_text(apply_matrix(text_to_blocks(ciphertext, key.n), key.inverse))
+
+
+def encrypt_many(plaintexts, key, pad=PAD):
+    """Encrypt many messages under one key with a single matrix product."""
+    key = _as_key(key)
+    blocks = [text_to_blocks(t, key.n, pad) for t in plaintexts]
+    out = blocks_to_text(apply_matrix(np.concatenate(blocks), key.matrix)) if blocks else ""
+    sizes = np.cumsum([0] + [b.size for b in blocks])
+    return [out[a:b] for a, b in zip(sizes, sizes[1:])]
+
+
+# ---- Step-by-step trace (display only) ----
+def trace(text, key, decrypting=False, pad=PAD):
+    """Yield one line per block showing the arithmetic (for teaching, not for speed)."""
+    key = _as_key(key)
+    matrix = (key.inverse if decrypting else key.matrix).tolist()
+    blocks = text_to_blocks(text, key.n, pad).tolist()
+    label = "C" if decrypting else "P"
+    for block in blocks:
+        letters = "".join(ALPHABET[x] for x in block)
+        parts = []
+        for row in matrix:
+            total = sum(k * x for k, x in zip(row, block))
+            terms = "+".join(f"{k}*{x}" for k, x in zip(row, block))
+            parts.append(f"{terms}={total} ≡ {total % MOD} -> '{ALPHABET[total % MOD]}'")
+        yield f" {letters} -> {label}={block} -> " + ", ".join(parts)
+
+
+# ---- Benchmark ----
+def benchmark(sizes=BENCHMARK_SIZES, letters=1 << 20, repeat=3, seed=1):
+    """
+    Encrypt + decrypt throughput for each block size.
+    Returns {n: letters per second} (best of repeat runs).
+    """
+    rng = random.Random(seed)
+    plaintext = "".join(rng.choice(ALPHABET) for _ in range(letters))
+    results = {}
+    for n in sizes:
+        key = random_key(n, rng)
+        best = math.inf
+        for _ in range(repeat):
+            start = time.perf_counter()
+            ciphertext = encrypt(plaintext, key)
+            recovered = decrypt(ciphertext, key)
+            best = min(best, time.perf_counter() - start)
+        if recovered[:len(plaintext)] != plaintext:
+            raise AssertionError(f"n={n}: decryption does not invert encryption")
+        results[n] = len(plaintext) / best
+    return results
+
+
+def main():
+    letters = int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 20
+    print(f"Hill cipher throughput, {letters:,} letters encrypted + decrypted")
+    for n, rate in benchmark(letters=letters).items():
+        print(f"  n={n}: {rate / 1e6:7.2f} M letters/s")
+
+
+if __name__ == "__main__":
+    main()
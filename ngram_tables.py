@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Corpus-trained English n-gram log-probability tables (bigrams .. quadgrams).
+
+Usage:
+  - Train: python3 ngram_tables.py corpus1.txt [corpus2.txt ...]
+    (writes ngram_data/english_2grams.f32, _3grams.f32 and _4grams.f32)
+  - Use:   import ngram_tables
+           quad = ngram_tables.load_table(4)
+           quad.score("SOMEPLAINTEXT")
+
+File format:
+  - A flat array of 26^n little-endian float32 values, no header.
+  - Cell index of the n-gram c1 c2 .. cn (A=0 .. Z=25) is c1*26^(n-1) + ... + cn.
+  - Each cell holds log10(count / total); unseen n-grams hold the floor
+    log10(0.01 / total).
+
+Notes:
+  - Tables are memory-mapped read-only and opened on first use, so a process
+    that never scores anything never touches the file, and worker processes
+    share the same page-cache pages instead of each parsing a text table.
+  - Only A-Z are counted; everything else is dropped before counting, so
+    n-grams run across spaces and punctuation.
+"""
+
+import math
+import mmap
+import os
+import sys
+from array import array
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+ORDERS = (2, 3, 4)
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ngram_data")
+FLOOR_COUNT = 0.01    # pseudo-count given to n-grams never seen in the corpus
+
+_LETTER_INDEX = {ch: i for i, ch in enumerate(ALPHABET)}
+_loaded = {}          # (n, path) -> NgramTable, one mapping per process
+
+
+def table_path(n, directory=None):
+    """Return the file path of the order-n table."""
+    return os.path.join(directory or DEFAULT_DIR, f"english_{n}grams.f32")
+
+
+def text_to_indices(text):
+    """Return the letters of text as a list of ints 0..25 (non-letters dropped)."""
+    index = _LETTER_INDEX
+    return [index[ch] for ch in text.upper() if ch in index]
+
+
+# ---- Training ----
+def count_ngrams(paths, orders=ORDERS, chunk_size=1 << 20):
+    """
+    Stream the corpus files in chunks and count n-grams for every order.
+    A rolling index is kept across chunk and file boundaries, so the result does
+    not depend on chunk_size. Returns {n: (array('q') of 26^n counts, total)}.
+    """
+    counts = {n: array('q', bytes(8 * 26 ** n)) for n in orders}
+    totals = {n: 0 for n in orders}
+    rolling = 0
+    seen = 0              # letters seen so far (capped at the largest order)
+    top = max(orders)
+    modulus = 26 ** top
+    index = _LETTER_INDEX
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                for ch in chunk.upper():
+                    c = index.get(ch)
+                    if c is None:
+                        continue
+                    rolling = (rolling * 26 + c) % modulus
+                    if seen < top:
+                        seen += 1
+                    for n in orders:
+                        if seen >= n:
+                            counts[n][rolling % (26 ** n)] += 1
+                            totals[n] += 1
+    return {n: (counts[n], totals[n]) for n in orders}
+
+
+def to_log_probs(counts, total, floor_count=FLOOR_COUNT):
+    """Convert an array of counts into an array('f') of log10 probabilities."""
+    if total == 0:
+        raise ValueError("corpus contains no n-grams of this order")
+    floor = math.log10(floor_count / total)
+    log_total = math.log10(total)
+    return array('f', (math.log10(c) - log_total if c else floor for c in counts))
+
+
+def write_table(path, table):
+    """Write an array('f') as flat little-endian float32."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    out = array('f', table)
+    if sys.byteorder != 'little':
+        out.byteswap()
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        out.tofile(f)
+    os.replace(tmp, path)    # readers never see a half-written table
+
+
+def train(paths, directory=None, orders=ORDERS):
+    """Train all orders from the corpus files and write them. Returns {n: path}."""
+    written = {}
+    for n, (counts, total) in count_ngrams(paths, orders).items():
+        path = table_path(n, directory)
+        write_table(path, to_log_probs(counts, total))
+        written[n] = path
+    return written
+
+
+# ---- Loading ----
+class NgramTable:
+    """
+    Read-only, lazily memory-mapped order-n log-probability table.
+    Nothing is opened until the first lookup.
+    """
+
+    def __init__(self, path, n=None):
+        self.path = path
+        self.n = n
+        self._mm = None
+        self._values = None
+
+    def _open(self):
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            n = round(math.log(size // 4, 26)) if size else 0
+            if size != 4 * 26 ** n or (self.n is not None and n != self.n):
+                raise ValueError(f"{self.path}: not a flat order-{self.n or '?'} float32 table")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.n = n
+        if sys.byteorder == 'little':
+            self._values = memoryview(self._mm).cast('f')
+        else:
+            swapped = array('f', self._mm)
+            swapped.byteswap()
+            self._values = swapped
+
+    @property
+    def values(self):
+        """The 26^n table as a flat sequence of floats (memoryview on the mapping)."""
+        if self._values is None:
+            self._open()
+        return self._values
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __len__(self):
+        return len(self.values)
+
+    def as_array(self):
+        """Return a read-only NumPy float32 view of the table (needs numpy)."""
+        import numpy as np
+        return np.frombuffer(self.values, dtype='<f4')
+
+    def score_indices(self, idx):
+        """Sum of log-probabilities of every n-gram in a list of letter indices."""
+        values = self.values
+        n = self.n
+        modulus = 26 ** n
+        total = 0.0
+        rolling = 0
+        for pos, c in enumerate(idx):
+            rolling = (rolling * 26 + c) % modulus
+            if pos >= n - 1:
+                total += values[rolling]
+        return total
+
+    def score(self, text):
+        """Log-probability fitness of text (letters only). Higher is better."""
+        return self.score_indices(text_to_indices(text))
+
+
+def tables_available(n=4, directory=None):
+    return os.path.exists(table_path(n, directory))
+
+
+def load_table(n=4, directory=None):
+    """Return the shared NgramTable for order n (mapped on first lookup)."""
+    path = table_path(n, directory)
+    key = (n, path)
+    if key not in _loaded:
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"{path} not found; train it first with: python3 ngram_tables.py <corpus files>")
+        _loaded[key] = NgramTable(path, n)
+    return _loaded[key]
+
+
+# ---- CLI ----
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 ngram_tables.py corpus1.txt [corpus2.txt ...]")
+        return
+    written = train(sys.argv[1:])
+    for n, path in sorted(written.items()):
+        print(f"order {n}: {path} ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
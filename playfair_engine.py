@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Compiled Playfair keys: every digraph looked up in a precomputed table.
+
+Usage:
+  - import playfair_engine as pf
+    key = pf.compile_key("KENNEDY")            # keyword, 25-letter square or 5x5 rows
+    pf.encrypt("Must see you", key)
+    pf.decrypt("KXJEYUREBE", key)
+    pf.encrypt_many(messages, key)
+
+Notes:
+  - A square is stored as a 25-letter string over ALPHABET (I/J combined).
+  - Compiling a key builds, once, the encrypt and decrypt result of all
+    25 x 25 letter pairs, both as digraph strings (for str work) and as pair
+    codes a * 25 + b (for solvers working on lists of ints). Encrypting or
+    decrypting a text is then one pass of table lookups.
+  - Compiled keys are cached by square, so repeated calls with the same
+    keyword (or many messages under one key) compile only once.
+  - Squares that differ only by a cyclic shift of the rows or columns are
+    the same key; canonical_square picks one of them (A in the top-left
+    corner) so searches can recognise squares they have already tried.
+"""
+
+from functools import lru_cache
+
+ALPHABET = "ABCDEFGHIKLMNOPQRSTUVWXYZ"
+FILLER = "X"
+KEY_CACHE_SIZE = 1024
+
+LETTER_INDEX = {ch: i for i, ch in enumerate(ALPHABET)}
+LETTER_INDEX["J"] = LETTER_INDEX["I"]
+
+# Upper-case letters only, J folded into I; everything else removed
+_CLEAN = str.maketrans(
+    "abcdefghijklmnopqrstuvwxyzJ",
+    "ABCDEFGHIIKLMNOPQRSTUVWXYZI",
+    "".join(chr(c) for c in range(128) if not chr(c).isalpha()))
+
+
+def clean_text(text):
+    """Return text upper-cased, letters only, with J written as I."""
+    text = text.translate(_CLEAN)
+    if not text.isascii():
+        text = "".join(ch for ch in text if ch in LETTER_INDEX)
+    return text
+
+
+# ---- Key squares ----
+def key_square(keyword):
+    """25-letter square from a keyword: its letters first, then the rest of ALPHABET."""
+    seen = dict.fromkeys(clean_text(keyword))
+    seen.update(dict.fromkeys(ALPHABET))
+    return "".join(seen)
+
+
+def as_square(key):
+    """Accept a keyword, a 25-letter square or a list of 5 rows; return the square string."""
+    if not isinstance(key, str):
+        key = "".join("".join(row) for row in key)
+    square = clean_text(key)
+    if len(square) == 25 and len(set(square)) == 25:
+        return square
+    return key_square(key)
+
+
+def square_rows(square):
+    """The square as a 5x5 list of lists (the layout the lab scripts print)."""
+    return [list(square[i:i + 5]) for i in range(0, 25, 5)]
+
+
+# Shifting all rows (or all columns) cyclically gives the same cipher, so every
+# square has 25 equivalent squares. SHIFTS[cell] is the cell order of the shift
+# that moves cell to the top-left corner: shifted = [square[i] for i in SHIFTS[cell]].
+SHIFTS = [[((r + cell // 5) % 5) * 5 + (c + cell % 5) % 5 for r in range(5) for c in range(5)]
+          for cell in range(25)]
+
+
+def equivalent_squares(square):
+    """The 25 row/column shifts of a square (all encrypt identically)."""
+    square = as_square(square)
+    return ["".join([square[i] for i in shift]) for shift in SHIFTS]
+
+
+def canonical_square(square):
+    """One representative per equivalence class: the shift with A in the top-left corner."""
+    square = as_square(square)
+    return "".join([square[i] for i in SHIFTS[square.index("A")]])
+
+
+def _cell_result(cell1, cell2, step):
+    """Playfair rule on square cells 0..24; step is +1 to encrypt and -1 to decrypt."""
+    r1, c1 = divmod(cell1, 5)
+    r2, c2 = divmod(cell2, 5)
+    if r1 == r2:
+        # Same row -> move right (left to decrypt)
+        return r1 * 5 + (c1 + step) % 5, r2 * 5 + (c2 + step) % 5
+    if c1 == c2:
+        # Same column -> move down (up to decrypt)
+        return ((r1 + step) % 5) * 5 + c1, ((r2 + step) % 5) * 5 + c2
+    # Rectangle rule -> swap columns
+    return r1 * 5 + c2, r2 * 5 + c1
+
+
+# The rule only looks at where the two letters sit, so it is the same for every
+# square: ENC_CELLS[cell1 * 25 + cell2] = out_cell1 * 25 + out_cell2.
+ENC_CELLS = [x * 25 + y for x, y in (_cell_result(i // 25, i % 25, 1) for i in range(625))]
+DEC_CELLS = [x * 25 + y for x, y in (_cell_result(i // 25, i % 25, -1) for i in range(625))]
+
+
+class PlayfairKey:
+    """
+    A key square with its digraph tables precomputed.
+    enc / dec:           {"AB": "..."} for all 625 pairs of ALPHABET letters
+    enc_codes / dec_codes: lists of 625 pair codes, code = a * 25 + b
+    """
+
+    __slots__ = ("square", "enc", "dec", "enc_codes", "dec_codes")
+
+    def __init__(self, square):
+        self.square = square
+        pos = [square.index(ch) for ch in ALPHABET]
+        self.enc, self.dec = {}, {}
+        self.enc_codes, self.dec_codes = [0] * 625, [0] * 625
+        for a, ch_a in enumerate(ALPHABET):
+            for b, ch_b in enumerate(ALPHABET):
+                cells = pos[a] * 25 + pos[b]
+                for rule, table, codes in ((ENC_CELLS, self.enc, self.enc_codes),
+                                           (DEC_CELLS, self.dec, self.dec_codes)):
+                    x, y = divmod(rule[cells], 25)
+                    table[ch_a + ch_b] = square[x] + square[y]
+                    codes[a * 25 + b] = LETTER_INDEX[square[x]] * 25 + LETTER_INDEX[square[y]]
+
+    def rows(self):
+        return square_rows(self.square)
+
+    def encrypt_prepared(self, prepared):
+        """Encrypt text that is already letters-only and split into valid pairs."""
+        enc = self.enc
+        return "".join([enc[prepared[i:i + 2]] for i in range(0, len(prepared), 2)])
+
+    def decrypt_prepared(self, ciphertext):
+        """Decrypt letters-only ciphertext of even length."""
+        dec = self.dec
+        return "".join([dec[ciphertext[i:i + 2]] for i in range(0, len(ciphertext), 2)])
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _compile(square):
+    return PlayfairKey(square)
+
+
+def compile_key(key):
+    """Return the cached PlayfairKey for a keyword, square string or 5x5 rows."""
+    if isinstance(key, PlayfairKey):
+        return key
+    return _compile(as_square(key))
+
+
+# ---- Text preparation ----
+def prepare_text(text, filler=FILLER):
+    """
+    Letters only (J -> I), split into pairs: a filler goes between the letters
+    of a doubled pair and after a final odd letter.
+    """
+    text = clean_text(text)
+    out = []
+    i, n = 0, len(text)
+    while i < n:
+        a = text[i]
+        b = text[i + 1] if i + 1 < n else filler
+        if a == b:
+            out.append(a + filler)
+            i += 1
+        else:
+            out.append(a + b)
+            i += 2
+    return "".join(out)
+
+
+def text_to_codes(text):
+    """Letters of already-clean text as pair codes a * 25 + b (text of even length)."""
+    index = LETTER_INDEX
+    return [index[a] * 25 + index[b] for a, b in zip(text[0::2], text[1::2])]
+
+
+def codes_to_text(codes):
+    return "".join([ALPHABET[c // 25] + ALPHABET[c % 25] for c in codes])
+
+
+# ---- Encryption ----
+def encrypt(plaintext, key):
+    return compile_key(key).encrypt_prepared(prepare_text(plaintext))
+
+
+def decrypt(ciphertext, key, filler=FILLER):
+    """Decrypt; non-letters are dropped and an odd last letter is padded with filler."""
+    text = clean_text(ciphertext)
+    if len(text) % 2:
+        text += filler
+    return compile_key(key).decrypt_prepared(text)
+
+
+def encrypt_many(plaintexts, key):
+    """Encrypt many messages under one key (compiled once)."""
+    compiled = compile_key(key)
+    return [compiled.encrypt_prepared(prepare_text(t)) for t in plaintexts]
+
+
+def decrypt_many(ciphertexts, key):
+    compiled = compile_key(key)
+    return [decrypt(t, compiled) for t in ciphertexts]
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Ciphertext-only Playfair solver: simulated annealing over key squares.
+
+Usage:
+  - python3 playfair_solver.py "CIPHERTEXT" [seconds]
+  - python3 playfair_solver.py --dict wordlist.txt "CIPHERTEXT" [workers]
+  - import playfair_solver
+    result = playfair_solver.solve(ciphertext, time_budget=300)
+    result.square, result.plaintext, result.rate
+
+Notes:
+  - Fitness is the quadgram log10 score from ngram_tables.py (train the tables
+    first: python3 ngram_tables.py <corpus files>).
+  - Moves: swap two letters (most of the time), swap two rows or two columns,
+    reverse the rows, the columns or the whole square, or transpose it.
+  - The plaintext of each distinct cipher digraph is kept in a table. The
+    Playfair rule depends only on cells (playfair_engine.DEC_CELLS), so after
+    a letter swap only the digraphs containing one of the two letters get new
+    output cells; every other entry is just read back through the new square.
+  - Annealing restarts from a fresh random square until the time budget runs
+    out (or target_score is reached); the best square over all runs wins.
+  - Dictionary mode (dictionary_attack) skips the search and scores the
+    square of every keyword in a wordlist instead, across a process pool.
+  - Ordinary English of 100+ letters usually falls in the first run or two.
+    Short, odd messages such as PT-109 (100 letters, telegraphese, garbled
+    letters) need a quadgram table trained on a few MB of English and may
+    take many runs.
+"""
+
+import heapq
+import math
+import multiprocessing
+import random
+import sys
+import time
+from collections import OrderedDict
+from operator import add, itemgetter
+
+import ngram_tables
+import playfair_engine as pf
+
+ITERATIONS = 25000        # annealing steps per restart
+TIME_BUDGET = 300.0       # seconds
+T_END = 0.5               # final annealing temperature (log10 score units)
+CACHE_SIZE = 200000       # transposition table entries kept by solve()
+DICT_BATCH = 2000         # keywords per dictionary-attack task
+DICT_TOP_K = 20
+# Chance of each move; whatever is left over is a two-letter swap
+SHAPE_MOVES = (("swap_rows", 0.02), ("swap_cols", 0.02), ("reverse_rows", 0.01),
+               ("reverse_cols", 0.01), ("reverse", 0.01), ("transpose", 0.01))
+
+# Playfair letter index (I/J combined) -> A-Z index used by the n-gram tables
+_TO_AZ = [ord(ch) - 65 for ch in pf.ALPHABET]
+# DEC_CELLS split into (cell1, cell2)
+_DEC_PAIRS = [divmod(c, 25) for c in pf.DEC_CELLS]
+_pair_tables = {}     # NgramTable path -> (even, odd) digraph-level quadgram tables
+
+
+class SolverResult:
+    __slots__ = ("score", "square", "plaintext", "iterations", "restarts", "seconds")
+
+    def __init__(self, score, square, plaintext, iterations, restarts, seconds):
+        self.score = score
+        self.square = square
+        self.plaintext = plaintext
+        self.iterations = iterations
+        self.restarts = restarts
+        self.seconds = seconds
+
+    @property
+    def rate(self):
+        """Annealing iterations per second."""
+        return self.iterations / self.seconds if self.seconds else 0.0
+
+
+# ---- Square moves (on a list of 25 letter indices) ----
+def _shape_move(square, move, rng):
+    rows = [square[r * 5:r * 5 + 5] for r in range(5)]
+    if move == "swap_rows":
+        i, j = rng.sample(range(5), 2)
+        rows[i], rows[j] = rows[j], rows[i]
+    elif move == "swap_cols":
+        i, j = rng.sample(range(5), 2)
+        for row in rows:
+            row[i], row[j] = row[j], row[i]
+    elif move == "reverse_rows":
+        rows.reverse()
+    elif move == "reverse_cols":
+        for row in rows:
+            row.reverse()
+    elif move == "reverse":
+        return square[::-1]
+    elif move == "transpose":
+        rows = [list(col) for col in zip(*rows)]
+    return [x for row in rows for x in row]
+
+
+class DigraphState:
+    """
+    A candidate square with the plaintext of every distinct cipher digraph.
+    digraphs: distinct cipher pairs (letter indices); message: the ciphertext
+    as indices into digraphs.
+    """
+
+    def __init__(self, digraphs, by_letter, square):
+        self.digraphs = digraphs
+        self.by_letter = by_letter           # letter -> ids of digraphs containing it
+        self.set_square(square)
+
+    def set_square(self, square):
+        self.square = square
+        self.pos = pos = [0] * 25
+        for cell, letter in enumerate(square):
+            pos[letter] = cell
+        dec = _DEC_PAIRS
+        self.cells = [dec[pos[a] * 25 + pos[b]] for a, b in self.digraphs]
+
+    def swap_letters(self, u, v):
+        """Swap letters u and v in place; only their digraphs get new cells."""
+        square, pos = self.square, self.pos
+        cu, cv = pos[u], pos[v]
+        square[cu], square[cv] = v, u
+        pos[u], pos[v] = cv, cu
+        dec, cells, digraphs = _DEC_PAIRS, self.cells, self.digraphs
+        for d in self.by_letter[u] | self.by_letter[v]:
+            a, b = digraphs[d]
+            cells[d] = dec[pos[a] * 25 + pos[b]]
+
+    def canonical(self):
+        """Bytes of the canonical square (see playfair_engine.canonical_square)."""
+        return bytes(map(self.square.__getitem__, pf.SHIFTS[self.pos[0]]))
+
+    def plain_codes(self):
+        """Plaintext pair code (a * 25 + b) of each distinct digraph."""
+        square = self.square
+        return [square[x] * 25 + square[y] for x, y in self.cells]
+
+
+def split_digraphs(ciphertext):
+    """Return (digraphs, message, by_letter) for letters-only, even-length ciphertext."""
+    codes = pf.text_to_codes(ciphertext)
+    ids = {}
+    message = [ids.setdefault(code, len(ids)) for code in codes]
+    digraphs = [divmod(code, 25) for code in ids]
+    by_letter = [set() for _ in range(25)]
+    for d, (a, b) in enumerate(digraphs):
+        by_letter[a].add(d)
+        by_letter[b].add(d)
+    return digraphs, message, by_letter
+
+
+def pair_tables(table):
+    """
+    Quadgram scores at digraph level, built once per table:
+    even[p * 625 + q]           quadgram of plaintext pairs p, q
+    odd[(b * 625 + q) * 25 + c] quadgram of letter b, pair q, letter c
+    (letters and pairs in Playfair indices), so a message of pairs is scored
+    with two lookups per pair and no letter-by-letter rolling index.
+    """
+    if table.n != 4:
+        raise ValueError("playfair_solver expects the order-4 table")
+    if table.path not in _pair_tables:
+        values = table.values
+        az = _TO_AZ
+        # A-Z quadgram index of pair p followed by pair q is prefix[p] + suffix[q]
+        prefix = [a * 17576 + b * 676 for a in az for b in az]
+        suffix = [c * 26 + d for c in az for d in az]
+        even = [values[p + q] for p in prefix for q in suffix]
+        odd = [values[b * 17576 + q * 26 + c] for b in az for q in suffix for c in az]
+        _pair_tables[table.path] = even, odd
+    return _pair_tables[table.path]
+
+
+def make_fitness(message, table):
+    """Return score(codes): quadgram log10 score of the message for per-digraph plain codes."""
+    even, odd = pair_tables(table)
+    even_at, odd_at = even.__getitem__, odd.__getitem__
+    gather = itemgetter(*message) if len(message) > 1 else (lambda codes: tuple(codes[d] for d in message))
+
+    def score(codes):
+        pairs = gather(codes)
+        total = sum(map(even_at, map(add, [p * 625 for p in pairs[:-1]], pairs[1:])))
+        middle = [(p % 25) * 15625 + q * 25 for p, q in zip(pairs, pairs[1:])]
+        return total + sum(map(odd_at, map(add, middle, [p // 25 for p in pairs[2:]])))
+    return score
+
+
+def start_temperature(letters):
+    """Starting temperature for a message of this many letters (total log10 score scale)."""
+    return max(3.0, 0.06 * letters)
+
+
+class TranspositionTable:
+    """
+    Scores of squares already evaluated, keyed on the canonical square (25
+    bytes), so equivalent squares and squares revisited within or across runs
+    are not scored again. Holds at most capacity entries; the least recently
+    used one is evicted first.
+    """
+
+    __slots__ = ("capacity", "entries", "hits", "misses")
+
+    def __init__(self, capacity=CACHE_SIZE):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def anneal(state, score, t_start, iterations=ITERATIONS, t_end=T_END, rng=random,
+           deadline=None, cache=None):
+    """
+    Simulated annealing from state; returns (best score, best square, steps done).
+    The temperature falls linearly from t_start to t_end. The deadline is
+    checked every 1000 steps, after the first batch, so a run always does
+    some work. With a TranspositionTable as cache, squares it already holds
+    are not rescored.
+    """
+    def evaluate():
+        if cache is None:
+            return score(state.plain_codes())
+        key = state.canonical()
+        value = cache.get(key)
+        if value is None:
+            value = score(state.plain_codes())
+            cache.put(key, value)
+        return value
+
+    current = evaluate()
+    best, best_square = current, state.square[:]
+    done = iterations
+    for step in range(iterations):
+        if deadline is not None and step and step % 1000 == 0 and time.monotonic() > deadline:
+            done = step
+            break
+        temp = t_start + (t_end - t_start) * step / iterations
+        roll = rng.random()
+        move = None
+        for name, p in SHAPE_MOVES:
+            if roll < p:
+                move = name
+                break
+            roll -= p
+        if move is None:
+            u, v = rng.sample(range(25), 2)
+            state.swap_letters(u, v)
+            candidate = evaluate()
+            delta = candidate - current
+            if delta >= 0 or rng.random() < math.exp(delta / temp):
+                current = candidate
+            else:
+                state.swap_letters(u, v)
+                continue
+        else:
+            previous = state.square
+            state.set_square(_shape_move(previous, move, rng))
+            candidate = evaluate()
+            delta = candidate - current
+            if delta >= 0 or rng.random() < math.exp(delta / temp):
+                current = candidate
+            else:
+                state.set_square(previous)
+                continue
+        if current > best:
+            best, best_square = current, state.square[:]
+    return best, best_square, done
+
+
+def solve(ciphertext, time_budget=TIME_BUDGET, iterations=ITERATIONS, target_score=None,
+          random_seed=None, table=None, t_start=None, t_end=T_END, cache_size=CACHE_SIZE,
+          verbose=False):
+    """
+    Recover a Playfair key square from ciphertext alone.
+    Restarts annealing until time_budget seconds pass or a run reaches
+    target_score; at least one run is made, even with no budget. All runs share one TranspositionTable of cache_size
+    entries (0 turns it off). Returns a SolverResult (square as a
+    25-letter string).
+    """
+    text = pf.clean_text(ciphertext)
+    if len(text) % 2:
+        text += pf.FILLER
+    if len(text) < 8:
+        raise ValueError("ciphertext too short to score")
+    table = table or ngram_tables.load_table(4)
+    digraphs, message, by_letter = split_digraphs(text)
+    score = make_fitness(message, table)
+    rng = random.Random(random_seed)
+    if t_start is None:
+        t_start = start_temperature(len(text))
+    cache = TranspositionTable(cache_size) if cache_size else None
+    start = time.monotonic()
+    deadline = start + time_budget
+    best, best_square = -math.inf, None
+    total_steps = restarts = 0
+    while restarts == 0 or time.monotonic() < deadline:
+        square = list(range(25))
+        rng.shuffle(square)
+        state = DigraphState(digraphs, by_letter, square)
+        run_best, run_square, steps = anneal(state, score, t_start, iterations, t_end,
+                                             rng=rng, deadline=deadline, cache=cache)
+        total_steps += steps
+        restarts += 1
+        if run_best > best:
+            best, best_square = run_best, run_square
+        if verbose:
+            elapsed = time.monotonic() - start
+            cached = f", cache hits {cache.hit_rate:.0%}" if cache is not None else ""
+            print(f"run {restarts}: {run_best:.1f} (best {best:.1f}), "
+                  f"{total_steps / elapsed:,.0f} it/s{cached}")
+        if target_score is not None and best >= target_score:
+            break
+    seconds = time.monotonic() - start
+    square = "".join(pf.ALPHABET[x] for x in best_square)
+    plaintext = pf.decrypt(text, square)
+    return SolverResult(best, square, plaintext, total_steps, restarts, seconds)
+
+
+# ---- Dictionary keywords ----
+class DictionaryResult:
+    __slots__ = ("candidates", "keywords", "squares", "seconds")
+
+    def __init__(self, candidates, keywords, squares, seconds):
+        self.candidates = candidates      # [(score, square, keyword), ...], best first
+        self.keywords = keywords          # keywords read
+        self.squares = squares            # distinct squares scored
+        self.seconds = seconds
+
+    @property
+    def rate(self):
+        """Keywords handled per second."""
+        return self.keywords / self.seconds if self.seconds else 0.0
+
+
+_worker = {}          # per-process scoring state for dictionary_attack
+
+
+def _init_dictionary_worker(text, table_path):
+    digraphs, message, by_letter = split_digraphs(text)
+    _worker['digraphs'] = digraphs
+    _worker['by_letter'] = by_letter
+    _worker['score'] = make_fitness(message, ngram_tables.NgramTable(table_path, 4))
+
+
+def _score_squares(args):
+    """Score a batch of (square, keyword); return this batch's top_k (score, square, keyword)."""
+    batch, top_k = args
+    digraphs, by_letter, score = _worker['digraphs'], _worker['by_letter'], _worker['score']
+    index = pf.LETTER_INDEX
+    best = []
+    for square, keyword in batch:
+        state = DigraphState(digraphs, by_letter, [index[ch] for ch in square])
+        item = (score(state.plain_codes()), square, keyword)
+        if len(best) < top_k:
+            heapq.heappush(best, item)
+        elif item > best[0]:
+            heapq.heapreplace(best, item)
+    return best
+
+
+def read_keywords(path):
+    """Stream the non-empty lines of a wordlist (one keyword or phrase per line)."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            keyword = line.strip()
+            if keyword:
+                yield keyword
+
+
+def dictionary_attack(ciphertext, wordlist, workers=4, top_k=DICT_TOP_K,
+                      batch_size=DICT_BATCH, table=None, verbose=False):
+    """
+    Try every keyword of a wordlist (a file path or an iterable of strings) as
+    a Playfair key. Keywords are turned into squares here (the same square
+    generate_key_square / generate_key_matrix build); squares equivalent to
+    one already seen are skipped through a set of canonical-square hashes, and the rest go in batches to a
+    process pool that scores them with the quadgram fitness. Only the top_k
+    candidates are kept. Returns a DictionaryResult.
+    """
+    text = pf.clean_text(ciphertext)
+    if len(text) % 2:
+        text += pf.FILLER
+    if len(text) < 8:
+        raise ValueError("ciphertext too short to score")
+    table = table or ngram_tables.load_table(4)
+    keywords = read_keywords(wordlist) if isinstance(wordlist, str) else iter(wordlist)
+    counts = {'keywords': 0, 'squares': 0}
+    start = time.monotonic()
+
+    def batches():
+        seen = set()
+        batch = []
+        for keyword in keywords:
+            counts['keywords'] += 1
+            square = pf.key_square(keyword)
+            digest = hash(pf.canonical_square(square))
+            if digest in seen:
+                continue
+            seen.add(digest)
+            batch.append((square, keyword))
+            if len(batch) == batch_size:
+                counts['squares'] += len(batch)
+                yield batch, top_k
+                batch = []
+        if batch:
+            counts['squares'] += len(batch)
+            yield batch, top_k
+
+    best = []
+
+    def keep(found):
+        leader = max(best) if best else None
+        for item in found:
+            if len(best) < top_k:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+        if verbose and best and max(best) != leader:
+            elapsed = time.monotonic() - start
+            print(f"{counts['keywords']:,} keywords, {counts['squares']:,} squares, "
+                  f"{counts['keywords'] / elapsed:,.0f} keys/s, best {max(best)[0]:.1f}")
+
+    if workers <= 1:
+        _init_dictionary_worker(text, table.path)
+        for job in batches():
+            keep(_score_squares(job))
+    else:
+        with multiprocessing.Pool(workers, initializer=_init_dictionary_worker,
+                                  initargs=(text, table.path)) as pool:
+            for found in pool.imap_unordered(_score_squares, batches()):
+                keep(found)
+    seconds = time.monotonic() - start
+    return DictionaryResult(sorted(best, reverse=True), counts['keywords'],
+                            counts['squares'], seconds)
+
+
+def main():
+    if len(sys.argv) >= 4 and sys.argv[1] == "--dict":
+        workers = int(sys.argv[4]) if len(sys.argv) > 4 else multiprocessing.cpu_count()
+        result = dictionary_attack(sys.argv[3], sys.argv[2], workers=workers, verbose=True)
+        print(f"\n{result.keywords:,} keywords ({result.squares:,} distinct squares) in "
+              f"{result.seconds:.1f}s: {result.rate:,.0f} keys/s")
+        for score, square, keyword in result.candidates[:10]:
+            print(f"{score:8.1f}  {keyword:<24} {pf.decrypt(sys.argv[3], square)[:50]}")
+        return
+    if len(sys.argv) < 2:
+        print('Usage: python3 playfair_solver.py "CIPHERTEXT" [seconds]')
+        print('       python3 playfair_solver.py --dict wordlist.txt "CIPHERTEXT" [workers]')
+        return
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else TIME_BUDGET
+    result = solve(sys.argv[1], time_budget=budget, verbose=True)
+    print(f"\nBest score {result.score:.1f} after {result.restarts} runs, "
+          f"{result.iterations:,} iterations ({result.rate:,.0f} it/s)")
+    for row in pf.square_rows(result.square):
+        print(" ".join(row))
+    print(result.plaintext)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Exhaustive S-DES key search: all 1024 keys against every block at once.
+
+Usage:
+  - import sdes_attack
+    sdes_attack.known_plaintext(plain, cipher, mode="cbc", iv=0xAA)   # -> [key, ...]
+    sdes_attack.ciphertext_only(cipher, mode="ctr", counter=0)         # -> [(score, key, plain), ...]
+  - python3 sdes_attack.py [blocks]       (brute-force throughput benchmark)
+
+Notes:
+  - sdes_core.all_tables() holds the encrypt (or decrypt) table of every
+    key as one (1024 x 256) array, so trying every key on a run of blocks is
+    a single fancy index tables[:, blocks]: a (keys x blocks) array, no
+    per-key or per-block Python loop.
+  - Known plaintext: what goes into the block cipher is known in every mode
+    (ECB: P; CBC: P xor the previous ciphertext block, the IV for the
+    first; CTR: the counter, with keystream P xor C), so a key is consistent
+    when tables[key, inputs] equals the expected outputs for every block.
+    Blocks are checked in chunks and only surviving keys carry on, so long
+    messages cost little more than short ones. With the CBC IV unknown
+    (iv=None) the first block is skipped.
+  - Ciphertext only: every key decrypts the whole message and is scored by
+    the log-frequency of its bytes as English text (TEXT_LOG_FREQ); keys
+    whose plaintext has a byte that never appears in text are dropped.
+  - An 8-bit block leaves many keys consistent with one or two blocks (each
+    block passes about 1 wrong key in 256); a few more blocks pin the key.
+"""
+
+import math
+import string
+import sys
+import time
+
+import numpy as np
+
+import sdes_core as sdes
+
+MODES = ("ecb", "cbc", "ctr")
+BLOCK_CHUNK = 4096        # blocks compared per (keys x blocks) step
+TOP_K = 10
+UNSEEN = -12.0            # log-frequency of bytes that never appear in text
+
+# Log-frequency of each byte in English text: letters (either case) by their
+# share of letters, space and common punctuation and digits at rough rates.
+_LETTER_FREQ = {
+    'E': 12.0, 'T': 9.1, 'A': 8.2, 'O': 7.5, 'I': 7.0, 'N': 6.7, 'S': 6.3,
+    'H': 6.1, 'R': 6.0, 'D': 4.3, 'L': 4.0, 'C': 2.8, 'U': 2.8, 'M': 2.4,
+    'W': 2.4, 'F': 2.2, 'G': 2.0, 'Y': 2.0, 'P': 1.9, 'B': 1.5, 'V': 1.0,
+    'K': 0.8, 'X': 0.2, 'J': 0.15, 'Q': 0.1, 'Z': 0.07
+}
+
+
+def _text_log_freq():
+    freq = np.zeros(256)
+    for letter, percent in _LETTER_FREQ.items():
+        freq[ord(letter.lower())] = percent * 0.75
+        freq[ord(letter)] = percent * 0.04
+    freq[ord(' ')] = 16.0
+    for ch in ".,'\"-\n":
+        freq[ord(ch)] = 0.8
+    for ch in string.digits + "!?;:()\r\t":
+        freq[ord(ch)] = 0.1
+    with np.errstate(divide='ignore'):
+        logs = np.log10(freq / freq.sum())
+    logs[freq == 0] = UNSEEN
+    return logs
+
+
+TEXT_LOG_FREQ = _text_log_freq()
+
+
+def _as_blocks(data):
+    if isinstance(data, str):
+        data = sdes.bits_to_bytes(data)
+    return np.frombuffer(bytes(data), dtype=np.uint8)
+
+
+def _check_mode(mode):
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+
+
+def counter_blocks(counter, count):
+    """CTR inputs counter, counter + 1, ... for count blocks (8-bit counter, wraps at 256)."""
+    return ((counter + np.arange(count)) & 0xFF).astype(np.uint8)
+
+
+def known_plaintext(plaintext, ciphertext, mode="ecb", iv=None, counter=0,
+                    chunk=BLOCK_CHUNK):
+    """
+    Every key (0..1023) that maps plaintext to ciphertext in the given mode.
+    plaintext / ciphertext: bytes or bit strings of equal length.
+    """
+    _check_mode(mode)
+    p, c = _as_blocks(plaintext), _as_blocks(ciphertext)
+    if len(p) != len(c):
+        raise ValueError("plaintext and ciphertext differ in length")
+    if mode == "ecb":
+        inputs, outputs = p, c
+    elif mode == "cbc":
+        if iv is None:
+            inputs, outputs = p[1:] ^ c[:-1], c[1:]
+        else:
+            inputs, outputs = p ^ np.concatenate([[iv], c[:-1]]).astype(np.uint8), c
+    else:
+        inputs, outputs = counter_blocks(counter, len(p)), p ^ c
+    tables = sdes.all_tables()
+    alive = np.arange(sdes.KEYS)
+    for start in range(0, len(inputs), chunk):
+        block_in = inputs[start:start + chunk]
+        block_out = outputs[start:start + chunk]
+        alive = alive[(tables[alive][:, block_in] == block_out).all(axis=1)]
+        if len(alive) == 0:
+            break
+    return alive.tolist()
+
+
+def decrypt_all(ciphertext, mode="ecb", iv=0, counter=0):
+    """The decryption of ciphertext under every key: a (1024 x blocks) uint8 array."""
+    _check_mode(mode)
+    c = _as_blocks(ciphertext)
+    if mode == "ctr":
+        return sdes.all_tables()[:, counter_blocks(counter, len(c))] ^ c
+    plain = sdes.all_tables(decrypt=True)[:, c]
+    if mode == "cbc":
+        plain ^= np.concatenate([[iv], c[:-1]]).astype(np.uint8)
+    return plain
+
+
+def score_keys(ciphertext, mode="ecb", iv=0, counter=0, chunk=BLOCK_CHUNK):
+    """
+    Text score of every key's decryption (sum of TEXT_LOG_FREQ, higher is
+    better) and whether it contains only bytes seen in text.
+    Returns (scores, printable), both of length 1024.
+    """
+    c = _as_blocks(ciphertext)
+    scores = np.zeros(sdes.KEYS)
+    printable = np.ones(sdes.KEYS, dtype=bool)
+    for start in range(0, len(c), chunk):
+        part = c[start:start + chunk]
+        prev = iv if start == 0 else int(c[start - 1])
+        logs = TEXT_LOG_FREQ[decrypt_all(part, mode, prev, (counter + start) & 0xFF)]
+        scores += logs.sum(axis=1)
+        printable &= (logs > UNSEEN).all(axis=1)
+    return scores, printable
+
+
+def ciphertext_only(ciphertext, mode="ecb", iv=0, counter=0, top_k=TOP_K):
+    """
+    Rank all keys by how much their decryption looks like English text.
+    Returns [(score, key, plaintext bytes), ...], best first, with keys
+    giving non-text bytes left out.
+    """
+    scores, printable = score_keys(ciphertext, mode, iv, counter)
+    keys = np.flatnonzero(printable)
+    keys = keys[np.argsort(-scores[keys], kind='stable')][:top_k]
+    c = _as_blocks(ciphertext).tobytes()
+    results = []
+    for key in keys.tolist():
+        if mode == "ecb":
+            plain = sdes.compile_key(key).decrypt_bytes(c)
+        elif mode == "cbc":
+            plain = sdes.cbc_decrypt(c, key, iv)
+        else:
+            plain = sdes.ctr_crypt(c, key, counter, wrap=True)
+        results.append((float(scores[key]), key, plain))
+    return results
+
+
+# ---- Benchmark ----
+def _best_time(run, repeat):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = run()
+        best = min(best, time.perf_counter() - start)
+    return best, found
+
+
+def benchmark(blocks=1 << 16, repeat=3, seed=1):
+    """
+    Brute-force throughput on one core. The reference workload is the full
+    (keys x blocks) evaluation: all 1024 keys decrypt and score `blocks` CBC
+    blocks. Returns (key-blocks per second, seconds for a known-plaintext
+    search of the same message).
+    """
+    rng = np.random.default_rng(seed)
+    key, iv = int(rng.integers(sdes.KEYS)), int(rng.integers(256))
+    plain = rng.choice(np.frombuffer(b"the quick brown fox jumps over a lazy dog ",
+                                     dtype=np.uint8), blocks).tobytes()
+    cipher = sdes.cbc_encrypt(plain, key, iv)
+    sdes.all_tables(), sdes.all_tables(decrypt=True)
+    seconds, found = _best_time(lambda: ciphertext_only(cipher, "cbc", iv), repeat)
+    if found[0][1] != key:
+        raise AssertionError(f"ciphertext-only search found key {found[0][1]}, expected {key}")
+    known_seconds, keys = _best_time(lambda: known_plaintext(plain, cipher, "cbc", iv), repeat)
+    if keys != [key]:
+        raise AssertionError(f"known-plaintext search found {keys}, expected [{key}]")
+    return sdes.KEYS * blocks / seconds, known_seconds
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 16
+    rate, known_seconds = benchmark(blocks)
+    print(f"S-DES brute force, all {sdes.KEYS} keys x {blocks:,} CBC blocks (one core)")
+    print(f"  ciphertext only: {rate / 1e6:8.1f} M key-blocks/s")
+    print(f"  known plaintext: {known_seconds * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Integer, table-driven Simplified DES (S-DES): 8-bit blocks, 10-bit keys.
+
+Usage:
+  - import sdes_core as sdes
+    key = sdes.compile_key(0b0111111101)        # or the bit string "0111111101"
+    key.encrypt_block(0b00000001)               # one block as an int
+    c = sdes.cbc_encrypt(b"attack at dawn", key, iv=0b10101010)
+    sdes.cbc_decrypt(c, key, iv=0b10101010)
+    sdes.ctr_crypt(data, key, counter=0)                        # up to 256 bytes
+    sdes.ctr_crypt(data[100:200], key, counter=0, offset=100)   # random access
+    sdes.ctr_crypt_file("in.bin", "out.bin", key, workers=4, wrap=True)
+    sdes.cbc_encrypt_stream(src, dst, key, iv)            # binary file objects
+    sdes.cbc_decrypt_file("in.bin", "out.bin", key, iv, workers=4)
+  - python3 sdes_core.py            (test vectors and a throughput check)
+
+Notes:
+  - Bits are numbered as in the textbook: bit 1 is the most significant bit
+    of the block, so "0000000100100011" is the bytes 0x01 0x23.
+  - The round function only ever sees a 4-bit half and an 8-bit subkey, so
+    its output is one lookup in a 16 x 256 table built once at import.
+  - A block cipher on 8 bits is a permutation of 0..255: compiling a key
+    evaluates it on all 256 blocks, once, and stores the encrypt and decrypt
+    tables as bytes. Byte buffers are then encrypted with bytes.translate
+    (or a NumPy take on arrays). Compiled keys are cached for all 1024 keys.
+  - CTR: the counter is one block, COUNTER_BITS = 8 bits. Block i of the
+    stream is XORed with E(counter + i), so any byte range can be produced
+    on its own from its offset (offset // BLOCK_SIZE blocks in) without
+    touching earlier data; ctr_crypt_file splits a file into chunks that a
+    process pool handles in any order, each written straight to its place
+    in the output file.
+  - CBC decryption needs only ciphertext: plaintext block i is
+    D(C[i]) xor C[i-1], one table lookup over the whole buffer and one XOR
+    with the buffer shifted by a block. Chunks of a file are independent
+    (each reads the byte before it as its IV), so cbc_decrypt_file runs
+    them in a pool like CTR. Encryption chains through its own output and
+    stays sequential; the *_stream functions handle either direction chunk
+    by chunk, so no message has to fit in memory.
+  - An 8-bit counter has only 256 values. By default a counter past 255
+    raises CounterOverflowError, so a message longer than the remaining
+    counter values is refused instead of reusing keystream. Callers that
+    accept the repeat ask for it with wrap=True: the counter then wraps from
+    255 to 0 and the keystream repeats every 256 bytes (a two-time pad).
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:      # encrypt_array / all_tables need NumPy; bytes work without it
+    np = None
+
+KEYS = 1024
+BLOCK_VALUES = 256
+BLOCK_SIZE = 1            # bytes per block
+COUNTER_BITS = 8          # CTR counter width (one block)
+CHUNK_SIZE = 1 << 20      # bytes per file task / stream read
+
+P10 = [3, 5, 2, 7, 4, 10, 1, 9, 8, 6]
+P8 = [6, 3, 7, 4, 8, 5, 10, 9]
+IP = [2, 6, 3, 1, 4, 8, 5, 7]
+IP_INV = [4, 1, 3, 5, 7, 2, 8, 6]
+EP = [4, 1, 2, 3, 2, 3, 4, 1]
+P4 = [2, 4, 3, 1]
+S0 = [[1, 0, 3, 2],
+      [3, 2, 1, 0],
+      [0, 2, 1, 3],
+      [3, 1, 3, 2]]
+S1 = [[0, 1, 2, 3],
+      [2, 0, 1, 3],
+      [3, 0, 1, 0],
+      [2, 1, 0, 3]]
+
+
+def permute(value, pattern, width):
+    """Apply a 1-based bit pattern to a width-bit int (bit 1 is the most significant)."""
+    out = 0
+    for position in pattern:
+        out = (out << 1) | ((value >> (width - position)) & 1)
+    return out
+
+
+def _rotate5(value, n):
+    return ((value << n) | (value >> (5 - n))) & 0x1F
+
+
+def subkeys(key):
+    """The two 8-bit round keys (K1, K2) of a 10-bit key."""
+    key = permute(key, P10, 10)
+    left, right = key >> 5, key & 0x1F
+    left, right = _rotate5(left, 1), _rotate5(right, 1)
+    k1 = permute((left << 5) | right, P8, 10)
+    left, right = _rotate5(left, 2), _rotate5(right, 2)
+    k2 = permute((left << 5) | right, P8, 10)
+    return k1, k2
+
+
+def _round_output(right, subkey):
+    """F(R, K): expand R, mix in the subkey, S-boxes, P4 (a 4-bit result)."""
+    x = permute(right, EP, 4) ^ subkey
+    a, b = x >> 4, x & 0xF
+    s0 = S0[((a >> 2) & 2) | (a & 1)][(a >> 1) & 3]
+    s1 = S1[((b >> 2) & 2) | (b & 1)][(b >> 1) & 3]
+    return permute((s0 << 2) | s1, P4, 4)
+
+
+# F_TABLE[subkey * 16 + right] = F(right, subkey)
+F_TABLE = bytes(_round_output(r, k) for k in range(256) for r in range(16))
+IP_TABLE = bytes(permute(b, IP, 8) for b in range(256))
+IP_INV_TABLE = bytes(permute(b, IP_INV, 8) for b in range(256))
+
+
+def fk(block, subkey):
+    """f_K on an 8-bit block: the left half is XORed with F(right, subkey)."""
+    return block ^ (F_TABLE[subkey * 16 + (block & 0xF)] << 4)
+
+
+def switch(block):
+    return ((block << 4) | (block >> 4)) & 0xFF
+
+
+def encrypt_block(block, k1, k2):
+    """Encrypt one block with explicit round keys (decrypt: swap k1 and k2)."""
+    x = fk(IP_TABLE[block], k1)
+    return IP_INV_TABLE[fk(switch(x), k2)]
+
+
+class SDESKey:
+    """
+    A 10-bit key with its round keys and its full block tables.
+    enc / dec: 256-byte tables, enc[p] = E(p) and dec[c] = D(c).
+    """
+
+    __slots__ = ("key", "k1", "k2", "enc", "dec")
+
+    def __init__(self, key):
+        self.key = key
+        self.k1, self.k2 = subkeys(key)
+        self.enc = bytes(encrypt_block(p, self.k1, self.k2) for p in range(BLOCK_VALUES))
+        dec = bytearray(BLOCK_VALUES)
+        for p, c in enumerate(self.enc):
+            dec[c] = p
+        self.dec = bytes(dec)
+
+    def __repr__(self):
+        return f"SDESKey({self.key:010b})"
+
+    def encrypt_block(self, block):
+        return self.enc[block]
+
+    def decrypt_block(self, block):
+        return self.dec[block]
+
+    def encrypt_bytes(self, data):
+        """ECB: every byte through the encrypt table."""
+        return bytes(data).translate(self.enc)
+
+    def decrypt_bytes(self, data):
+        return bytes(data).translate(self.dec)
+
+
+@lru_cache(maxsize=KEYS)
+def _compile(key):
+    return SDESKey(key)
+
+
+def compile_key(key):
+    """Return the cached SDESKey for a 10-bit int or a 10-character bit string."""
+    if isinstance(key, SDESKey):
+        return key
+    if isinstance(key, str):
+        key = int(key, 2)
+    if not 0 <= key < KEYS:
+        raise ValueError(f"S-DES key must be 10 bits, got {key}")
+    return _compile(key)
+
+
+@lru_cache(maxsize=None)
+def all_tables(decrypt=False):
+    """
+    (1024 x 256) read-only uint8 array of every key's encrypt table, or of
+    every decrypt table (needs numpy); row k belongs to key k.
+    """
+    tables = b"".join(compile_key(k).dec if decrypt else compile_key(k).enc for k in range(KEYS))
+    return np.frombuffer(tables, dtype=np.uint8).reshape(KEYS, BLOCK_VALUES)
+
+
+def encrypt_array(blocks, key):
+    """ECB on a NumPy uint8 array: one take through the encrypt table."""
+    return np.frombuffer(compile_key(key).enc, dtype=np.uint8).take(blocks)
+
+
+def decrypt_array(blocks, key):
+    return np.frombuffer(compile_key(key).dec, dtype=np.uint8).take(blocks)
+
+
+# ---- Modes on byte strings ----
+def xor_bytes(a, b):
+    """XOR two byte strings of equal length (one big-int operation)."""
+    n = len(a)
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(n, 'big')
+
+
+def cbc_encrypt(data, key, iv):
+    """CBC encrypt; iv is one byte as an int. Each block depends on the last, so this is a loop."""
+    enc = compile_key(key).enc
+    out = bytearray(len(data))
+    prev = iv
+    for i, p in enumerate(data):
+        prev = out[i] = enc[p ^ prev]
+    return bytes(out)
+
+
+def cbc_decrypt(data, key, iv):
+    """CBC decrypt: all blocks decrypted at once, then XORed with the previous ciphertext."""
+    data = bytes(data)
+    if not data:
+        return b""
+    return xor_bytes(data.translate(compile_key(key).dec), bytes([iv]) + data[:-1])
+
+
+def cbc_encrypt_stream(src, dst, key, iv, chunk_size=CHUNK_SIZE):
+    """
+    CBC encrypt everything read from the binary stream src into dst, one
+    chunk at a time (the chain carries over between chunks). Returns the
+    number of bytes written.
+    """
+    key = compile_key(key)
+    total = 0
+    while True:
+        data = src.read(chunk_size)
+        if not data:
+            return total
+        out = cbc_encrypt(data, key, iv)
+        iv = out[-1]
+        dst.write(out)
+        total += len(out)
+
+
+def cbc_decrypt_stream(src, dst, key, iv, chunk_size=CHUNK_SIZE):
+    """
+    CBC decrypt src into dst chunk by chunk; each chunk is decrypted at
+    once (cbc_decrypt) with the last ciphertext byte of the chunk before as
+    its IV. Returns the number of bytes written.
+    """
+    key = compile_key(key)
+    total = 0
+    while True:
+        data = src.read(chunk_size)
+        if not data:
+            return total
+        dst.write(cbc_decrypt(data, key, iv))
+        iv = data[-1]
+        total += len(data)
+
+
+class CounterOverflowError(ValueError):
+    """A CTR counter would pass 2^COUNTER_BITS - 1 with wrapping turned off."""
+
+
+def check_counter(counter, end, wrap=False):
+    """
+    Check a CTR stream of end bytes starting at counter. Without wrapping
+    the last block's counter must still fit in COUNTER_BITS.
+    """
+    if not 0 <= counter < 1 << COUNTER_BITS:
+        raise ValueError(f"counter must be {COUNTER_BITS} bits, got {counter}")
+    last = counter + max(end - 1, 0) // BLOCK_SIZE
+    if not wrap and last >= 1 << COUNTER_BITS:
+        raise CounterOverflowError(
+            f"counter {counter} + {last - counter} blocks passes {(1 << COUNTER_BITS) - 1}")
+
+
+def ctr_keystream(key, counter, length, offset=0, wrap=False):
+    """
+    length keystream bytes starting offset bytes into the stream: block
+    offset // BLOCK_SIZE is E(counter + offset // BLOCK_SIZE), and so on.
+    CounterOverflowError is raised if the counter would go past the last
+    value; with wrap=True it is taken mod 2^COUNTER_BITS instead.
+    """
+    check_counter(counter, offset + length, wrap)
+    first = counter + offset // BLOCK_SIZE
+    period = 1 << COUNTER_BITS
+    counters = bytes((first + i) % period for i in range(min(length, period)))
+    stream = counters.translate(compile_key(key).enc)
+    if length > period:
+        stream = (stream * (length // period + 1))[:length]
+    return stream
+
+
+def ctr_crypt(data, key, counter=0, offset=0, wrap=False):
+    """
+    CTR encrypt or decrypt (the same operation). offset is where data starts
+    in the whole stream, so any slice of a message can be handled alone.
+    """
+    data = bytes(data)
+    return xor_bytes(data, ctr_keystream(key, counter, len(data), offset, wrap))
+
+
+def _crypt_chunk(args):
+    """
+    En/decrypt one chunk of in_path into its place in out_path (runs in a
+    worker). mode is "ctr" or "cbc-decrypt"; for CBC the byte before the
+    chunk is read as well, since it is the chunk's IV.
+    """
+    mode, in_path, out_path, key, start_value, offset, out_offset, size, wrap = args
+    with open(in_path, 'rb') as f:
+        if mode == "cbc-decrypt" and offset > 0:
+            f.seek(offset - 1)
+            start_value = f.read(1)[0]
+        else:
+            f.seek(offset)
+        data = f.read(size)
+    if len(data) != size:
+        raise ValueError(f"{in_path} ended early")
+    if mode == "ctr":
+        out_data = ctr_crypt(data, key, start_value, offset, wrap)
+    else:
+        out_data = cbc_decrypt(data, key, start_value)
+    with open(out_path, 'r+b') as out:
+        out.seek(out_offset)
+        out.write(out_data)
+    return size
+
+
+def _crypt_file(mode, in_path, out_path, key, start_value, start, length, workers,
+                chunk_size, wrap=False):
+    """Split a byte range of in_path into chunks for _crypt_chunk, in a pool if workers > 1."""
+    with open(out_path, 'wb') as out:
+        out.truncate(length)
+    jobs = [(mode, in_path, out_path, key, start_value, offset, offset - start,
+             min(chunk_size, start + length - offset), wrap)
+            for offset in range(start, start + length, chunk_size)]
+    if workers <= 1 or len(jobs) <= 1:
+        return sum(map(_crypt_chunk, jobs))
+    with multiprocessing.Pool(workers) as pool:
+        return sum(pool.imap_unordered(_crypt_chunk, jobs))
+
+
+def ctr_crypt_file(in_path, out_path, key, counter=0, start=0, length=None, workers=4,
+                   chunk_size=CHUNK_SIZE, wrap=False):
+    """
+    CTR over bytes start .. start + length of in_path (default: to the end),
+    written to out_path. Each chunk is read at its own offset, keyed from
+    that offset and written straight to its place in the output by a pool
+    of workers, so nothing passes through the parent process.
+    Returns the number of bytes written.
+    """
+    key = compile_key(key).key
+    if length is None:
+        length = os.path.getsize(in_path) - start
+    check_counter(counter, start + length, wrap)
+    return _crypt_file("ctr", in_path, out_path, key, counter, start, length, workers,
+                       chunk_size, wrap)
+
+
+def cbc_decrypt_file(in_path, out_path, key, iv, workers=4, chunk_size=CHUNK_SIZE):
+    """
+    CBC decrypt a whole file in parallel: plaintext block i needs only
+    ciphertext blocks i and i - 1, so every chunk (read with the byte before
+    it) is decrypted and written to its place independently.
+    Encryption has no such shortcut; use cbc_encrypt_stream.
+    Returns the number of bytes written.
+    """
+    key = compile_key(key).key
+    length = os.path.getsize(in_path)
+    return _crypt_file("cbc-decrypt", in_path, out_path, key, iv, 0, length, workers, chunk_size)
+
+
+# ---- Bit strings (the layout the lab scripts use) ----
+def bits_to_bytes(bits):
+    """'0000000100100011' -> b'\\x01#' (length must be a multiple of 8)."""
+    if len(bits) % 8:
+        raise ValueError("bit string length must be a multiple of 8")
+    return int(bits, 2).to_bytes(len(bits) // 8, 'big') if bits else b""
+
+
+def bytes_to_bits(data):
+    return "".join(format(b, '08b') for b in data)
+
+
+# ---- Self-test / benchmark ----
+TEST_VECTORS = [
+    # (mode, key, iv / counter, plaintext bits, ciphertext bits)
+    ("cbc", "0111111101", "10101010", "0000000100100011", "1111010000001011"),
+    ("ctr", "0111111101", "00000000", "000000010000001000000100", "001110000100111100110010"),
+]
+
+
+def self_test():
+    """Check the documented lab vectors; returns True if all pass."""
+    ok = True
+    for mode, key, start, plain, cipher in TEST_VECTORS:
+        data = bits_to_bytes(plain)
+        if mode == "cbc":
+            out = cbc_encrypt(data, key, int(start, 2))
+            back = cbc_decrypt(out, key, int(start, 2))
+        else:
+            out = ctr_crypt(data, key, int(start, 2))
+            back = ctr_crypt(out, key, int(start, 2))
+        passed = bytes_to_bits(out) == cipher and back == data
+        ok &= passed
+        print(f"{mode.upper()} key {key}: {bytes_to_bits(out)} {'ok' if passed else 'FAILED'}")
+    ok &= _check_ctr_counter()
+    return ok
+
+
+def _check_ctr_counter():
+    """CTR counter width, wrap-around and random access behave as documented."""
+    key = 0b0111111101
+    data = bytes(range(256)) * 3
+    stream = ctr_crypt(data, key, counter=250, wrap=True)
+    keystream = xor_bytes(stream, data)
+    checks = {
+        # block i uses E((250 + i) mod 256): block 6 wraps to counter 0
+        "wraps at 256": keystream[6] == compile_key(key).enc[0],
+        "period 256": keystream[:256] == keystream[256:512] == keystream[512:],
+        "random access": all(ctr_crypt(data[a:b], key, 250, offset=a, wrap=True) == stream[a:b]
+                             for a, b in ((0, 1), (5, 7), (300, 700), (767, 768))),
+        "fits without wrap": ctr_crypt(data[:6], key, 250) == stream[:6],
+    }
+    # the default refuses to wrap: a stream past counter 255 raises
+    for name, run in (("overflow raises", lambda: ctr_crypt(data[:7], key, 250)),
+                      ("file overflow raises", lambda: check_counter(0, 257))):
+        try:
+            run()
+            checks[name] = False
+        except CounterOverflowError:
+            checks[name] = True
+    for name, passed in checks.items():
+        print(f"CTR counter, {name}: {'ok' if passed else 'FAILED'}")
+    return all(checks.values())
+
+
+def main():
+    if not self_test():
+        sys.exit(1)
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 22
+    data = bytes(range(256)) * (size // 256)
+    start = time.perf_counter()
+    for k in range(KEYS):
+        compile_key(k)
+    print(f"compiled all {KEYS} keys in {time.perf_counter() - start:.2f}s")
+    for name, run in (("ECB", lambda: compile_key(0b0111111101).encrypt_bytes(data)),
+                      ("CBC decrypt", lambda: cbc_decrypt(data, 0b0111111101, 0xAA)),
+                      ("CTR", lambda: ctr_crypt(data, 0b0111111101, 0, wrap=True))):
+        start = time.perf_counter()
+        run()
+        print(f"{name:<12} {len(data) / (time.perf_counter() - start) / 1e6:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
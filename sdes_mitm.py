@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Double and triple S-DES, and a meet-in-the-middle attack on them.
+
+Usage:
+  - import sdes_mitm
+    keys = sdes_mitm.generate_key(stages=3)          # (k1, k2, k3), like generate_3des_key
+    c = sdes_mitm.encrypt(plaintext, keys)
+    result = sdes_mitm.attack(plaintext, c, stages=3)
+    result.keys, result.index_bytes, result.seconds
+  - python3 sdes_mitm.py            (MITM against brute force for every construction)
+
+Notes:
+  - Constructions work block by block (ECB) on sdes_core's key tables, the
+    same cipher as sdes_encrypt_block / sdes_decrypt_block in crypt lab 22.py:
+      double:      C = E_k2(E_k1(P))
+      triple EDE:  C = E_k3(D_k2(E_k1(P)))   (k3 = k1 for the 2-key variant,
+                   keyed as in crypt lab 19.py's generate_3des_key)
+  - The attack meets after the first encryption. E_k1 of the first
+    INDEX_BLOCKS known plaintext blocks is packed into one int per k1 and
+    sorted (SortedIndex: a uint32 array of values and a uint16 array of keys,
+    6 bytes per key). Every remaining key choice decrypts the ciphertext back
+    to the middle and is looked up with np.searchsorted; matches are then
+    checked against the other known pairs.
+  - Work: double 2 * 2^10 block tables instead of 2^20 key pairs; 3-key
+    triple 2^10 + 2^20 instead of 2^30. The 2-key variant has k1 on both
+    sides of the middle, so there is nothing to split: it is swept as 2^20
+    key pairs, no better than brute force on double S-DES.
+  - Each known byte rules out all but 1 in 256 wrong keys, so pin the key
+    with 3 pairs for double and 4 or more for triple S-DES. Different keys
+    can still give the same permutation of the 256 blocks; no number of
+    pairs separates those.
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import sdes_core as sdes
+
+INDEX_BLOCKS = 3          # known blocks packed into each index value (24 bits)
+K3_CHUNK = 256            # third-stage keys probed per step of the triple attack
+BRUTE_SAMPLE = 8          # first-stage keys timed when a full brute force is too long
+
+
+def generate_key(stages=3, triple_key=True, rng=random):
+    """
+    Random keys: (k1, k2) for stages=2; for stages=3, (k1, k2, k3), or
+    (k1, k2, k1) with triple_key False (2-key triple S-DES).
+    """
+    k1, k2, k3 = (rng.randrange(sdes.KEYS) for _ in range(3))
+    if stages == 2:
+        return k1, k2
+    return (k1, k2, k3) if triple_key else (k1, k2, k1)
+
+
+def _keys(keys):
+    keys = tuple(int(k, 2) if isinstance(k, str) else k for k in keys)
+    if len(keys) not in (2, 3):
+        raise ValueError("give 2 keys (double) or 3 keys (triple EDE)")
+    return keys
+
+
+def encrypt(data, keys):
+    """Double (2 keys) or triple EDE (3 keys) S-DES on every byte of data."""
+    keys = _keys(keys)
+    data = bytes(data)
+    if len(keys) == 2:
+        return sdes.compile_key(keys[1]).encrypt_bytes(sdes.compile_key(keys[0]).encrypt_bytes(data))
+    k1, k2, k3 = (sdes.compile_key(k) for k in keys)
+    return k3.encrypt_bytes(k2.decrypt_bytes(k1.encrypt_bytes(data)))
+
+
+def decrypt(data, keys):
+    keys = _keys(keys)
+    data = bytes(data)
+    if len(keys) == 2:
+        return sdes.compile_key(keys[0]).decrypt_bytes(sdes.compile_key(keys[1]).decrypt_bytes(data))
+    k1, k2, k3 = (sdes.compile_key(k) for k in keys)
+    return k1.decrypt_bytes(k2.encrypt_bytes(k3.decrypt_bytes(data)))
+
+
+class SortedIndex:
+    """
+    Sorted lookup from a packed middle value to the keys producing it.
+    values: sorted uint32 array; keys: uint16 array in the same order.
+    """
+
+    __slots__ = ("values", "keys")
+
+    def __init__(self, values):
+        order = np.argsort(values, kind='stable')
+        self.values = values[order].astype(np.uint32)
+        self.keys = order.astype(np.uint16)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.keys.nbytes
+
+    def probe(self, queries):
+        """All matches as (query positions, keys): one pair per equal value."""
+        lo = np.searchsorted(self.values, queries, side='left')
+        hi = np.searchsorted(self.values, queries, side='right')
+        counts = hi - lo
+        where = np.repeat(np.arange(len(queries)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return where, self.keys[np.repeat(lo, counts) + offsets]
+
+
+def pack(blocks):
+    """Pack the columns of a (rows x m) uint8 array, m <= 4, into one uint32 per row."""
+    value = np.zeros(blocks.shape[:-1], dtype=np.uint32)
+    for j in range(blocks.shape[-1]):
+        value = (value << 8) | blocks[..., j]
+    return value
+
+
+class MITMResult:
+    __slots__ = ("keys", "candidates", "index_bytes", "peak_bytes", "seconds")
+
+    def __init__(self, keys, candidates, index_bytes, peak_bytes, seconds):
+        self.keys = keys                  # [(k1, k2) or (k1, k2, k3), ...] fitting every pair
+        self.candidates = candidates      # index matches before checking the other pairs
+        self.index_bytes = index_bytes    # size of the sorted index
+        self.peak_bytes = peak_bytes      # peak memory of a separate traced run (None if not traced)
+        self.seconds = seconds
+
+
+def _pairs(plaintext, ciphertext):
+    p = np.frombuffer(bytes(plaintext), dtype=np.uint8)
+    c = np.frombuffer(bytes(ciphertext), dtype=np.uint8)
+    if len(p) != len(c) or len(p) == 0:
+        raise ValueError("need equal, non-empty known plaintext and ciphertext")
+    return p, c
+
+
+def _double(p, c, enc, dec):
+    m = min(INDEX_BLOCKS, len(p))
+    index = SortedIndex(pack(enc[:, p[:m]]))
+    k2, k1 = index.probe(pack(dec[:, c[:m]]))
+    candidates = len(k1)
+    ok = (enc[k2[:, None], enc[k1[:, None], p]] == c).all(axis=1)
+    return [(int(a), int(b)) for a, b in zip(k1[ok], k2[ok])], candidates, index.nbytes
+
+
+def _triple(p, c, enc, dec):
+    m = min(INDEX_BLOCKS, len(p))
+    index = SortedIndex(pack(enc[:, p[:m]]))
+    found, candidates = [], 0
+    for start in range(0, sdes.KEYS, K3_CHUNK):
+        k3s = np.arange(start, min(start + K3_CHUNK, sdes.KEYS))
+        # middle value E_k2(D_k3(C)) for every (k3 in chunk, k2): (k3s, 1024, m)
+        middle = enc[:, dec[k3s][:, c[:m]]].transpose(1, 0, 2)
+        where, k1 = index.probe(pack(middle).ravel())
+        candidates += len(k1)
+        k3, k2 = k3s[where // sdes.KEYS], where % sdes.KEYS
+        back = enc[k3[:, None], dec[k2[:, None], enc[k1[:, None], p]]]
+        ok = (back == c).all(axis=1)
+        found.extend((int(a), int(b), int(d)) for a, b, d in zip(k1[ok], k2[ok], k3[ok]))
+    return found, candidates, index.nbytes
+
+
+def _two_key_triple(p, c, enc, dec):
+    found = []
+    forward, backward = enc[:, p], dec[:, c]          # E_k1(P), D_k1(C) for every k1
+    for k2 in range(sdes.KEYS):
+        ok = np.flatnonzero((dec[k2][forward] == backward).all(axis=1))
+        found.extend((int(k1), k2, int(k1)) for k1 in ok)
+    return found, len(found), 0
+
+
+def attack(plaintext, ciphertext, stages=2, two_key=False, trace_memory=True):
+    """
+    Every key fitting all known (plaintext, ciphertext) bytes of double
+    (stages=2) or triple EDE (stages=3; two_key for k3 = k1) S-DES.
+    The timed run is untraced; with trace_memory the attack is run a second
+    time under tracemalloc for peak_bytes, so tracing never slows the timing.
+    Returns an MITMResult.
+    """
+    p, c = _pairs(plaintext, ciphertext)
+    enc, dec = sdes.all_tables(), sdes.all_tables(decrypt=True)
+    if stages == 2:
+        solver = _double
+    elif stages == 3:
+        solver = _two_key_triple if two_key else _triple
+    else:
+        raise ValueError("stages must be 2 or 3")
+    start = time.perf_counter()
+    keys, candidates, index_bytes = solver(p, c, enc, dec)
+    seconds = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+        solver(p, c, enc, dec)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return MITMResult(sorted(keys), candidates, index_bytes, peak, seconds)
+
+
+def brute_force(plaintext, ciphertext, stages=2, two_key=False, first_keys=None):
+    """
+    Naive search over every key pair (double, 2-key triple) or key triple
+    (3-key triple), all second keys at once per loop step. first_keys limits
+    the outer keys tried (to time a sample of a search too long to finish).
+    Returns (keys found, seconds, fraction of the key space covered).
+    """
+    p, c = _pairs(plaintext, ciphertext)
+    enc, dec = sdes.all_tables(), sdes.all_tables(decrypt=True)
+    outer = range(sdes.KEYS) if first_keys is None else first_keys
+    found = []
+    start = time.perf_counter()
+    for k1 in outer:
+        first = enc[k1][p]
+        if stages == 2:
+            found.extend((k1, int(k2)) for k2 in np.flatnonzero((enc[:, first] == c).all(axis=1)))
+            continue
+        middle = dec[:, first]                                     # (k2, blocks)
+        for k3 in ([k1] if two_key else range(sdes.KEYS)):
+            for k2 in np.flatnonzero((enc[k3][middle] == c).all(axis=1)):
+                found.append((k1, int(k2), k3))
+    return found, time.perf_counter() - start, len(outer) / sdes.KEYS
+
+
+def main():
+    pairs = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    rng = random.Random(1)
+    plaintext = bytes(rng.randrange(256) for _ in range(pairs))
+    for label, stages, two_key in (("double", 2, False), ("triple, 3 keys", 3, False),
+                                   ("triple, 2 keys", 3, True)):
+        keys = generate_key(stages, not two_key, rng)
+        ciphertext = encrypt(plaintext, keys)
+        result = attack(plaintext, ciphertext, stages, two_key)
+        assert keys in result.keys, "attack missed the key"
+        sample = range(BRUTE_SAMPLE) if stages == 3 and not two_key else None
+        _, seconds, covered = brute_force(plaintext, ciphertext, stages, two_key, sample)
+        naive = seconds / covered
+        estimate = "" if covered == 1 else " (estimated)"
+        print(f"{label}: key {keys}, {pairs} known pairs")
+        print(f"  meet in the middle {result.seconds * 1e3:9.1f} ms, index "
+              f"{result.index_bytes:,} bytes, peak {result.peak_bytes / 1e6:.1f} MB, "
+              f"{result.candidates:,} candidates -> {len(result.keys)} keys")
+        print(f"  brute force        {naive * 1e3:9.1f} ms{estimate}, "
+              f"{naive / result.seconds:,.0f}x slower")
+
+
+if __name__ == "__main__":
+    main()